@@ -1,47 +1,70 @@
+import os
+
 import streamlit as st
-import gspread
-from google.oauth2.service_account import Credentials
+
+from triagem_classificacao import Classificador, carregar_regras
+from triagem_duplicatas import IndiceEnvios, chave_idempotencia
+from triagem_fila import FilaEnvio, enviar_para_planilha
+from triagem_sheets import conexao_de_secrets
+
+# Fila local dos envios (SQLite); as linhas são enviadas em lotes por uma
+# thread de fundo, sem bloquear o formulário
+CAMINHO_FILA = "triagem_fila.sqlite3"
+# Tabela de regras de classificação (opcional)
+ARQUIVO_REGRAS = "regras_classificacao.json"
 
 # ================================
 # CONFIGURAÇÃO DA CONEXÃO GOOGLE
 # ================================
+@st.cache_resource
 def conectar_google_sheets():
     """
-    Faz autenticação com Google Sheets usando credenciais de serviço
+    Conexão com Google Sheets compartilhada por todas as sessões.
+    A autenticação só acontece na primeira operação e é refeita
+    automaticamente em caso de erro de autenticação/HTTP.
     """
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive"
-    ]
-
-    creds = Credentials.from_service_account_info(
-        st.secrets["gcp_service_account"],
-        scopes=scope
-    )
+    return conexao_de_secrets(st.secrets)
 
-    client = gspread.authorize(creds)
 
-    # Nome da planilha no Google Sheets
-    sheet = client.open("Triagem_Clientes").sheet1
+@st.cache_resource
+def obter_fila_envio():
+    """
+    Fila de envio compartilhada pelo processo, com a thread de envio já iniciada.
+    """
+    fila = FilaEnvio(
+        st.secrets.get("fila_triagem_db", CAMINHO_FILA),
+        enviar_para_planilha(conectar_google_sheets())
+    )
+    return fila.iniciar()
 
-    return sheet
+
+@st.cache_resource
+def obter_indice_envios():
+    """
+    Índice local dos envios recentes (detecção de duplicados, validade de 24h).
+    """
+    return IndiceEnvios(st.secrets.get("fila_triagem_db", CAMINHO_FILA))
 
 
 # ================================
 # CLASSIFICAÇÃO DA DEMANDA
 # ================================
-def classificar_demanda(tipo):
+@st.cache_resource
+def obter_classificador():
     """
-    Classifica automaticamente a demanda
+    Classificador compilado uma vez por processo. As regras vêm de
+    regras_classificacao.json quando o arquivo existe (senão, regras padrão).
     """
-    tipo = tipo.lower()
+    if os.path.exists(ARQUIVO_REGRAS):
+        return Classificador(carregar_regras(ARQUIVO_REGRAS))
+    return Classificador()
 
-    if "aposentadoria" in tipo or "benefício" in tipo or "inss" in tipo:
-        return "Previdenciário"
-    elif "rescisão" in tipo or "trabalho" in tipo or "fgts" in tipo:
-        return "Trabalhista"
-    else:
-        return "Outros"
+
+def classificar_demanda(tipo, urgencia=""):
+    """
+    Classifica automaticamente a demanda (tipo e, se preciso, o texto de urgência)
+    """
+    return obter_classificador().classificar(tipo, urgencia)
 
 
 # ================================
@@ -99,10 +122,7 @@ with st.form("form_triagem"):
 if enviar:
     try:
         # Classificação automática
-        classificacao = classificar_demanda(tipo_de_demanda)
-
-        # Conecta na planilha
-        sheet = conectar_google_sheets()
+        classificacao = classificar_demanda(tipo_de_demanda, urgencia)
 
         # Prepara dados para envio
         dados = [
@@ -115,11 +135,24 @@ if enviar:
             contato_preferencial
         ]
 
-        # Envia para o Google Sheets
-        sheet.append_row(dados)
-
-        # Mensagem de sucesso
-        st.success("✅ Dados enviados com sucesso! Em breve entraremos em contato.")
+        # Envios repetidos (mesmo nome, demanda e contato) não geram nova linha:
+        # se o original ainda está na fila, ele é atualizado com os dados novos
+        hash_envio = chave_idempotencia(nome, tipo_de_demanda, contato_preferencial)
+        novo, chave_envio = obter_indice_envios().registrar(hash_envio)
+        fila = obter_fila_envio()
+
+        if novo:
+            # Grava na fila local; o envio ao Google Sheets é feito em lote
+            try:
+                fila.enfileirar(dados, chave_envio)
+            except Exception:
+                obter_indice_envios().esquecer(hash_envio)
+                raise
+            st.success("✅ Dados enviados com sucesso! Em breve entraremos em contato.")
+        elif fila.atualizar_pendente(chave_envio, dados):
+            st.success("✅ Seus dados foram atualizados! Em breve entraremos em contato.")
+        else:
+            st.info("ℹ️ Já recebemos uma solicitação igual a esta. Em breve entraremos em contato.")
 
     except Exception as e:
         st.error(f"Erro ao enviar dados: {e}")
@@ -0,0 +1,392 @@
+"""
+Leitura e análise de boletins escolares, sem dependência do Streamlit.
+
+Usada pelo app Boletim-classapp-3lo.py: texto livre (heurísticas por linha),
+Modelo CSV/XLSX (leitura direta), médias anuais, pontos de atenção e
+gráficos. matplotlib e plotly só são importados ao gerar um gráfico.
+"""
+
+import hashlib
+import re
+from collections import namedtuple
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+# Colunas do "Modelo CSV": quando o cabeçalho é reconhecido, o arquivo é lido
+# diretamente (leitura vetorizada com tipos explícitos), sem as heurísticas.
+TEMPLATE_COLUMNS = [
+    'Disciplina',
+    'A1_1tri', 'A2_1tri', 'A3_1tri', 'Med_1tri',
+    'A1_2tri', 'A2_2tri', 'A3_2tri', 'Med_2tri',
+    'A1_3tri', 'A2_3tri', 'A3_3tri', 'Med_3tri',
+    'Faltas', 'MA'
+]
+
+
+def extract_header(text):
+    header = {}
+    # patterns for basic fields
+    m = re.search(r'Aluno\(?a\)?:\s*(.+)', text, re.IGNORECASE)
+    if m: header['Aluno'] = m.group(1).strip()
+    m = re.search(r'Matr[ií]cula:\s*([\w\-]+)', text, re.IGNORECASE)
+    if m: header['Matrícula'] = m.group(1).strip()
+    m = re.search(r'Emiss[aã]o:\s*([0-9]{2}/[0-9]{2}/[0-9]{4})', text)
+    if m: header['Emissão'] = m.group(1)
+    # Unidade / Curso / Turma line (one-liner)
+    m = re.search(r'CD\s*-\s*(.+)', text)
+    if m:
+        header['CursoInfo'] = m.group(1).strip()
+    else:
+        # try to capture line that has 'Ensino' or 'Unidade'
+        m2 = re.search(r'(Ensino Fundamental.*)', text, re.IGNORECASE)
+        if m2:
+            header['CursoInfo'] = m2.group(1).strip()
+    return header
+
+
+# Padrões pré-compilados: cada linha é varrida uma única vez por _RE_TOKEN,
+# que captura ao mesmo tempo os números e as palavras típicas de cabeçalho.
+_RE_TOKEN = re.compile(
+    r'(?P<num>\d+[.,]?\d*)|(?P<hdr>Emiss|Matr|Aluno|Situa|Disciplinas)',
+    re.IGNORECASE,
+)
+_RE_INICIO_DISCIPLINA = re.compile(r'^[A-Za-z\"\'\s]')
+
+LINHA_CABECALHO = 'header'
+LINHA_DISCIPLINA = 'disciplina'
+LINHA_RUIDO = 'ruido'
+
+LineToken = namedtuple('LineToken', ['kind', 'name', 'numbers', 'n_words', 'raw'])
+
+
+def tokenize_line(line):
+    """
+    Varre a linha uma única vez e devolve um LineToken com:
+    - kind: 'header', 'disciplina' ou 'ruido'
+    - name: texto inicial até o primeiro número
+    - numbers: todos os números da linha (vírgula decimal normalizada)
+    """
+    stripped = line.strip()
+    numbers = []
+    first_num = None
+    is_header = False
+    for m in _RE_TOKEN.finditer(stripped):
+        if m.lastgroup == 'num':
+            if first_num is None:
+                first_num = m.start()
+            numbers.append(float(m.group().replace(',', '.')))
+        else:
+            is_header = True
+
+    if first_num is None:
+        name = stripped
+    else:
+        name = stripped[:first_num].strip().strip('-').strip()
+
+    if is_header:
+        kind = LINHA_CABECALHO
+    elif numbers and _RE_INICIO_DISCIPLINA.match(line):
+        kind = LINHA_DISCIPLINA
+    else:
+        kind = LINHA_RUIDO
+    return LineToken(kind, name, numbers, len(stripped.split()), stripped)
+
+
+def tokenize_boletim(text):
+    """Tokeniza todas as linhas não vazias do boletim (uma passada por linha)."""
+    return [tokenize_line(l) for l in text.splitlines() if l.strip()]
+
+
+def numbers_from_line(line):
+    # extract floats like 9,0 or 10,0 and also 9.5
+    return tokenize_line(line).numbers
+
+
+def parse_discipline_line(token):
+    """
+    Heurística:
+    - Extrai nome (texto inicial até encontrar primeiro número)
+    - Extrai todos os números da linha
+    - Tenta dividir os números em 3 trimestres. Se houver >=9 números, assumir 3 blocos de 3 notas (A1,A2,A3) e possivelmente médias.
+    - Calcula média por trimestre como média das notas disponíveis no bloco.
+    - Calcula média anual como soma das médias dos trimestres (ou média simples * 2 quando aparecem valores do tipo 20)
+
+    Aceita um LineToken (já tokenizado) ou a linha em texto.
+    """
+    if isinstance(token, str):
+        token = tokenize_line(token)
+    name = token.name
+    nums = token.numbers
+    line = token.raw
+
+    # attempt to interpret nums
+    trimesters = []
+    used_for_annual = []
+    if len(nums) >= 9:
+        # take first 9 numbers as three groups of 3 (A1,A2,A3) each
+        for t in range(3):
+            block = nums[t*3:(t+1)*3]
+            if len(block) > 0:
+                tr_mean = sum(block)/len(block)
+                trimesters.append(round(tr_mean,2))
+                used_for_annual.append(tr_mean)
+        # attempt to find yearly MA near the end (value >10 likely is 20.0 used as scaled sum)
+        annual = None
+        for candidate in reversed(nums):
+            if candidate >= 0:
+                # if candidate > 10 and typical appears as 20.0 in sample, keep but also compute from trimesters
+                annual = candidate
+                break
+        if annual is None:
+            annual = round(sum(used_for_annual),2)
+    elif len(nums) >= 3:
+        # fewer numbers: split equally
+        n = len(nums)
+        chunk = max(1, n//3)
+        for t in range(3):
+            start = t*chunk
+            block = nums[start:start+chunk]
+            if block:
+                trimesters.append(round(sum(block)/len(block),2))
+        annual = round(sum(trimesters),2) if trimesters else None
+    else:
+        trimesters = []
+        annual = None
+
+    # construct return dict
+    return {
+        'Disciplina': name if name else 'Desconhecida',
+        'Trimestres': trimesters,
+        'MA_guess': annual,
+        'RawNumbers': nums,
+        'RawLine': line
+    }
+
+
+# --- Chart helpers
+
+CHART_MATPLOTLIB = 'Matplotlib (imagem)'
+CHART_PLOTLY = 'Plotly (interativo)'
+CHART_COLUMNS = ['Disciplina', 'Med_1tri', 'Med_2tri', 'Med_3tri', 'MA_computed']
+TRIMESTER_SERIES = [('Med_1tri', '1º Tri'), ('Med_2tri', '2º Tri'), ('Med_3tri', '3º Tri')]
+
+
+def chart_data_hash(data):
+    """Hash estável do conteúdo (valores + nomes de colunas) de um DataFrame."""
+    h = hashlib.sha1(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    h.update('|'.join(map(str, data.columns)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _figure_to_png(fig):
+    import matplotlib.pyplot as plt
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def annual_bar_png(chart_df):
+    """Gráfico de barras da média anual estimada (PNG)."""
+    import matplotlib.pyplot as plt
+
+    x = np.arange(len(chart_df))
+    fig, ax = plt.subplots(figsize=(10,4))
+    ax.bar(x, chart_df['MA_computed'])
+    ax.set_title('Média Anual (estimada) por disciplina')
+    ax.set_ylim(0, max(10, np.nanmax(chart_df['MA_computed']) + 1))
+    ax.set_ylabel('MA estimada (escala escola)')
+    ax.set_xticks(x)
+    ax.set_xticklabels(chart_df['Disciplina'], rotation=45, ha='right')
+    return _figure_to_png(fig)
+
+
+def trimester_line_png(chart_df):
+    """Gráfico de linhas das médias por trimestre (PNG)."""
+    import matplotlib.pyplot as plt
+
+    x = np.arange(len(chart_df))
+    fig, ax = plt.subplots(figsize=(10,4))
+    for col, label in TRIMESTER_SERIES:
+        ax.plot(x, chart_df[col], marker='o', label=label)
+    ax.set_xticks(x)
+    ax.set_xticklabels(chart_df['Disciplina'], rotation=45, ha='right')
+    ax.set_title('Comparação de Médias por Trimestre')
+    ax.set_ylim(0, 10)
+    ax.legend()
+    return _figure_to_png(fig)
+
+
+def plotly_charts(chart_df):
+    """Figuras Plotly (barras da média anual, linhas dos trimestres)."""
+    import plotly.graph_objects as go
+
+    disciplinas = chart_df['Disciplina'].tolist()
+    fig_bar = go.Figure(go.Bar(x=disciplinas, y=chart_df['MA_computed']))
+    fig_bar.update_layout(
+        title='Média Anual (estimada) por disciplina',
+        yaxis_title='MA estimada (escala escola)',
+        yaxis_range=[0, max(10, np.nanmax(chart_df['MA_computed']) + 1)],
+    )
+    fig_line = go.Figure([
+        go.Scatter(x=disciplinas, y=chart_df[col], mode='lines+markers', name=label)
+        for col, label in TRIMESTER_SERIES
+    ])
+    fig_line.update_layout(title='Comparação de Médias por Trimestre', yaxis_range=[0, 10])
+    return fig_bar, fig_line
+
+
+def parse_free_text(text):
+    """Aplica as heurísticas de texto livre e devolve o DataFrame de disciplinas."""
+    # tokenize each line once; the classification and the numbers are reused below
+    tokens = tokenize_boletim(text)
+    # probable discipline lines: contain at least one number, start with a letter and are not header lines
+    disc_lines = [t for t in tokens if t.kind == LINHA_DISCIPLINA]
+
+    # If too few disc_lines, try alternative: lines that have many numbers (reusing the tokens, no re-parsing)
+    if len(disc_lines) < 4:
+        cand = [t for t in tokens if len(t.numbers) >= 3 and t.n_words < 40]
+        if len(cand) > len(disc_lines):
+            disc_lines = cand
+
+    parsed = [parse_discipline_line(l) for l in disc_lines]
+
+    # Build DataFrame
+    rows = []
+    for p in parsed:
+        tr = p['Trimestres']
+        # ensure length 3
+        while len(tr) < 3:
+            tr.append(np.nan)
+        row = {
+            'Disciplina': p['Disciplina'],
+            'A1_1tri': np.nan, 'A2_1tri': np.nan, 'A3_1tri': np.nan,
+            'Med_1tri': tr[0] if len(tr) > 0 else np.nan,
+            'A1_2tri': np.nan, 'A2_2tri': np.nan, 'A3_2tri': np.nan,
+            'Med_2tri': tr[1] if len(tr) > 1 else np.nan,
+            'A1_3tri': np.nan, 'A2_3tri': np.nan, 'A3_3tri': np.nan,
+            'Med_3tri': tr[2] if len(tr) > 2 else np.nan,
+            'MA_guess': p['MA_guess']
+        }
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+# --- Template (CSV/XLSX) ingestion
+
+TEMPLATE_DTYPES = {c: 'float64' for c in TEMPLATE_COLUMNS[1:]}
+TEMPLATE_DTYPES['Disciplina'] = str
+TEMPLATE_NA_VALUES = ['', ' ', '-']
+# Faixas válidas por coluna (MA segue a escala da escola: soma dos trimestres)
+TEMPLATE_RANGES = {c: (0, 10) for c in TEMPLATE_COLUMNS[1:13]}
+TEMPLATE_RANGES['Faltas'] = (0, None)
+TEMPLATE_RANGES['MA'] = (0, 30)
+
+
+def is_template_csv(text):
+    """Reconhece o cabeçalho do Modelo CSV (separador vírgula ou ponto e vírgula)."""
+    first = next((l for l in text.splitlines() if l.strip()), '')
+    cols = [c.strip().lstrip('\ufeff') for c in re.split(r'[;,]', first)]
+    return cols[:2] == TEMPLATE_COLUMNS[:2] and 'Med_1tri' in cols
+
+
+def _read_template_csv_bytes(data):
+    first = data.split(b'\n', 1)[0]
+    # exportações pt-BR usam ';' como separador e ',' como decimal
+    sep, decimal = (';', ',') if b';' in first else (',', '.')
+    return pd.read_csv(BytesIO(data), engine='c', sep=sep, decimal=decimal, dtype=TEMPLATE_DTYPES,
+                       na_values=TEMPLATE_NA_VALUES, encoding='utf-8-sig', skipinitialspace=True)
+
+
+def read_template(source, filename=''):
+    """
+    Lê o Modelo CSV/XLSX em uma única leitura vetorizada e devolve
+    (df, problemas). Valores fora das faixas válidas viram NaN e são listados
+    em `problemas`.
+    """
+    if filename.lower().endswith('.xlsx'):
+        df = pd.read_excel(source, dtype=TEMPLATE_DTYPES, na_values=TEMPLATE_NA_VALUES)
+    else:
+        data = source.encode('utf-8') if isinstance(source, str) else source.read()
+        df = _read_template_csv_bytes(data)
+
+    df.columns = [str(c).strip() for c in df.columns]
+    missing = [c for c in TEMPLATE_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Colunas ausentes no modelo: {', '.join(missing)}")
+
+    problems = validate_template_ranges(df)
+    df = df[TEMPLATE_COLUMNS].rename(columns={'MA': 'MA_guess'})
+    df['Disciplina'] = df['Disciplina'].fillna('Desconhecida').str.strip()
+
+    # médias trimestrais em branco são calculadas a partir das avaliações
+    for t in (1, 2, 3):
+        med = f'Med_{t}tri'
+        evals = df[[f'A1_{t}tri', f'A2_{t}tri', f'A3_{t}tri']]
+        df[med] = df[med].fillna(evals.mean(axis=1).round(2))
+    return df, problems
+
+
+def validate_template_ranges(df):
+    """Marca como NaN (in place) os valores fora da faixa e devolve a lista de problemas."""
+    problems = []
+    for col, (low, high) in TEMPLATE_RANGES.items():
+        values = df[col]
+        invalid = values < low
+        if high is not None:
+            invalid |= values > high
+        if invalid.any():
+            for idx in df.index[invalid]:
+                problems.append(f"{df.at[idx, 'Disciplina']}: {col} = {values[idx]} fora da faixa")
+            df.loc[invalid, col] = np.nan
+    return problems
+
+
+def compute_annual_from_trimesters(row):
+    """Média anual a partir das médias trimestrais (ou a MA informada)."""
+    meds = [row['Med_1tri'], row['Med_2tri'], row['Med_3tri']]
+    meds = [m for m in meds if not pd.isna(m)]
+    if len(meds) == 3:
+        # some schools sum trimesters (ex.: 10+10+0 -> 20). We'll compute a normalized annual mean: average of trimester means * 2
+        # but safer: if MA_guess exists and is >10, keep MA_guess; else compute sum
+        guess = row.get('MA_guess', None)
+        if pd.notna(guess) and guess > 10:
+            annual = guess
+        else:
+            # compute scaled annual to match sample where 20.0 appears as 'MA'
+            annual = round(sum(meds),2)
+    elif len(meds) > 0:
+        annual = round(np.nanmean(meds)* (3 if len(meds)==1 else 3/len(meds)),2)
+    else:
+        annual = row.get('MA_guess', np.nan)
+    return annual
+
+
+# --- Attention rules
+
+ATT_THRESHOLD = 7.0  # below this needs attention
+DROP_THRESHOLD = 1.5  # drop between trimesters considered significant
+
+
+def attention_notes(df):
+    """Pontos de atenção de cada disciplina ('OK' se não houver), na ordem de df."""
+    attentions = []
+    for _, r in df.iterrows():
+        notes = []
+        meds = [r['Med_1tri'], r['Med_2tri'], r['Med_3tri']]
+        meds_clean = [m for m in meds if not pd.isna(m)]
+        if any((m < ATT_THRESHOLD) for m in meds_clean):
+            notes.append('Média trimestral abaixo de {:.1f}'.format(ATT_THRESHOLD))
+        # check drops
+        for i in range(len(meds_clean)-1):
+            if meds_clean[i+1] + DROP_THRESHOLD < meds_clean[i]:
+                notes.append('Queda significativa do {}º para {}º trimestre'.format(i+1, i+2))
+        # annual
+        if pd.notna(r['MA_computed']) and r['MA_computed'] < ATT_THRESHOLD:
+            notes.append('Média anual baixa')
+        attentions.append('; '.join(notes) if notes else 'OK')
+    return attentions
@@ -0,0 +1,98 @@
+import hashlib
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from hiscre import IndiceRubricas, lancamentos_hiscre
+
+st.set_page_config(page_title="Buscador de Rubricas no HISCRE", page_icon="🔍", layout="wide")
+
+
+# ================================
+# INDEXAÇÃO (uma vez por conjunto de arquivos)
+# ================================
+@st.cache_data(max_entries=64, show_spinner=False)
+def ler_hiscre(conteudo, nome):
+    """Lançamentos de um PDF do HISCRE (em cache pelo conteúdo do arquivo)."""
+    return lancamentos_hiscre(BytesIO(conteudo), arquivo=nome, on_error=st.warning)
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def montar_indice(chaves, _arquivos):
+    """Índice de rubricas dos arquivos enviados (chaves = hashes dos arquivos)."""
+    return IndiceRubricas([ler_hiscre(a.getvalue(), a.name) for a in _arquivos])
+
+
+def para_excel(resultado, por_competencia):
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        resultado.to_excel(writer, index=False, sheet_name="Lancamentos")
+        por_competencia.to_excel(writer, index=False, sheet_name="Por_Competencia")
+    return buffer.getvalue()
+
+
+# ================================
+# INTERFACE STREAMLIT
+# ================================
+st.title("🔍 Buscador de Rubricas no HISCRE")
+st.write("Envie um ou mais PDFs do Histórico de Créditos (HISCRE) e escolha quantas rubricas quiser.")
+
+arquivos = st.file_uploader("PDFs do HISCRE", type=["pdf"], accept_multiple_files=True)
+if not arquivos:
+    st.stop()
+
+chaves = tuple(hashlib.sha1(a.getvalue()).hexdigest() for a in arquivos)
+with st.spinner("📖 Lendo e indexando os arquivos (somente na primeira vez)..."):
+    indice = montar_indice(chaves, arquivos)
+
+rubricas = indice.rubricas()
+if rubricas.empty:
+    st.error("❌ Nenhum lançamento de rubrica encontrado nos arquivos.")
+    st.stop()
+
+st.success(f"✅ {len(indice.lancamentos)} lançamento(s) de {len(rubricas)} rubrica(s) em {len(arquivos)} arquivo(s)")
+
+descricoes = dict(zip(rubricas["rubrica"], rubricas["descricao"]))
+escolhidas = st.multiselect(
+    "Rubricas:",
+    options=rubricas["rubrica"].tolist(),
+    format_func=lambda r: f"{r} - {descricoes.get(r, '')}",
+)
+
+competencias = indice.lancamentos["competencia"]
+col1, col2 = st.columns(2)
+with col1:
+    inicio = st.date_input("Competência inicial", value=competencias.min().date())
+with col2:
+    fim = st.date_input("Competência final", value=competencias.max().date())
+
+if escolhidas:
+    resultado = indice.buscar(escolhidas, inicio=inicio, fim=fim)
+    por_competencia = indice.tabela_por_competencia(escolhidas, inicio=inicio, fim=fim)
+
+    st.subheader("📋 Lançamentos em ordem cronológica")
+    exibicao = resultado.assign(competencia=resultado["competencia"].dt.strftime("%m/%Y"))
+    st.dataframe(exibicao, use_container_width=True)
+
+    st.subheader("📅 Rubricas por competência")
+    st.dataframe(
+        por_competencia.assign(competencia=por_competencia["competencia"].dt.strftime("%m/%Y")),
+        use_container_width=True
+    )
+
+    col3, col4 = st.columns(2)
+    with col3:
+        st.download_button(
+            "📥 Baixar CSV",
+            data=exibicao.to_csv(index=False, sep=";", decimal=","),
+            file_name="rubricas_hiscre.csv",
+            mime="text/csv",
+        )
+    with col4:
+        st.download_button(
+            "📥 Baixar Excel",
+            data=para_excel(resultado, por_competencia),
+            file_name="rubricas_hiscre.xlsx",
+            mime="application/vnd.ms-excel",
+        )
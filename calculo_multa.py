@@ -0,0 +1,205 @@
+"""
+Cálculo de multa diária em lote, com correção pela SELIC.
+
+Entrada: uma tabela de faixas de multa, uma linha por faixa
+
+    caso | inicio     | fim        | valor_diario
+    A    | 2024-01-10 | 2024-03-05 | 100
+    A    | 2024-03-06 | 2024-04-30 | 150
+    B    | ...
+
+Cada faixa é distribuída pelos meses que abrange com aritmética de datas
+vetorizada (NumPy), contando dias corridos ou dias úteis (feriados nacionais
+do workalendar). O total de cada mês é corrigido até o mês de atualização
+pela regra do Sicalc (correcao_selic.py) e o resultado sai detalhado por
+caso e mês, além de um resumo por caso.
+
+Uso em linha de comando:
+
+    python calculo_multa.py casos.xlsx resultado.xlsx --atualizacao 2025-12 [--dias-uteis]
+"""
+
+import argparse
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from correcao_selic import SIMPLES, tabela_correcao
+from selic import como_ordinal, formatar_mes
+
+COLUNAS_FAIXAS = ["caso", "inicio", "fim", "valor_diario"]
+
+# Nomes alternativos aceitos nas planilhas de entrada
+SINONIMOS = {
+    "processo": "caso",
+    "data_inicio": "inicio",
+    "data_inicial": "inicio",
+    "data_fim": "fim",
+    "data_final": "fim",
+    "valor": "valor_diario",
+    "multa_diaria": "valor_diario",
+    "valor_multa": "valor_diario",
+}
+
+
+def _normalizar_coluna(nome):
+    nome = unicodedata.normalize("NFKD", str(nome))
+    nome = "".join(ch for ch in nome if not unicodedata.combining(ch))
+    nome = "_".join(nome.lower().split())
+    return SINONIMOS.get(nome, nome)
+
+
+def _datas(coluna):
+    """
+    Datas em ISO (2024-01-10) ou no formato brasileiro (10/01/2024). O
+    dayfirst não é aplicado às datas ISO, que seriam lidas com dia e mês trocados.
+    """
+    if pd.api.types.is_datetime64_any_dtype(coluna):
+        return coluna.dt.normalize()
+    datas = pd.to_datetime(coluna, format="ISO8601", errors="coerce")
+    faltando = datas.isna() & coluna.notna()
+    if faltando.any():
+        datas[faltando] = pd.to_datetime(coluna[faltando].astype(str).str.strip(), format="%d/%m/%Y",
+                                         errors="coerce")
+    invalidas = coluna[datas.isna() & coluna.notna()]
+    if len(invalidas):
+        exemplos = ", ".join(map(str, invalidas.unique()[:5]))
+        raise ValueError(f"Datas inválidas (use AAAA-MM-DD ou DD/MM/AAAA): {exemplos}")
+    return datas.dt.normalize()
+
+
+def preparar_faixas(faixas):
+    """Padroniza colunas e tipos da tabela de faixas e valida os períodos."""
+    df = faixas.rename(columns=_normalizar_coluna)
+    faltando = [c for c in COLUNAS_FAIXAS if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes na tabela de faixas: {', '.join(faltando)}")
+
+    # células só com espaços contam como vazias; linhas totalmente em branco
+    # (comuns no fim das planilhas) são ignoradas
+    df = df[COLUNAS_FAIXAS].reset_index(drop=True).replace(r"^\s*$", np.nan, regex=True)
+    df = df.dropna(how="all").copy()
+    df["caso"] = df["caso"].astype(str).str.strip()
+    df["inicio"] = _datas(df["inicio"])
+    df["fim"] = _datas(df["fim"])
+    if not pd.api.types.is_numeric_dtype(df["valor_diario"]):
+        # valores no formato brasileiro (1.234,56): o ponto só é separador de
+        # milhar quando há vírgula decimal
+        df["valor_diario"] = (df["valor_diario"].astype(str).str.strip()
+                              .str.replace(r"\.(?=.*,)", "", regex=True)
+                              .str.replace(",", ".", regex=False))
+    df["valor_diario"] = pd.to_numeric(df["valor_diario"])
+
+    incompletas = df.index[df[["inicio", "fim", "valor_diario"]].isna().any(axis=1)]
+    if len(incompletas):
+        # linha da planilha: o índice começa em 0 e a linha 1 é o cabeçalho
+        linhas = ", ".join(str(i + 2) for i in incompletas)
+        raise ValueError(f"Faixas sem data inicial, data final ou valor diário (linhas {linhas} da planilha)")
+
+    invalidas = df.index[df["fim"] < df["inicio"]]
+    if len(invalidas):
+        casos = ", ".join(df.loc[invalidas, "caso"].unique())
+        raise ValueError(f"Faixas com data final anterior à inicial (casos: {casos})")
+    return df
+
+
+@lru_cache(maxsize=16)
+def feriados(ano_inicial, ano_final, calendario="Brazil"):
+    """Feriados (datetime64[D]) do calendário workalendar entre os anos informados."""
+    from workalendar import america
+
+    cal = getattr(america, calendario)()
+    dias = [d for ano in range(ano_inicial, ano_final + 1) for d, _ in cal.holidays(ano)]
+    return np.array(sorted(set(dias)), dtype="datetime64[D]")
+
+
+def expandir_por_mes(faixas, dias_uteis=False, calendario="Brazil"):
+    """
+    Distribui cada faixa pelos meses que ela abrange e devolve, por caso e
+    mês, a quantidade de dias e o valor da multa.
+    """
+    df = preparar_faixas(faixas)
+    inicio = df["inicio"].to_numpy(dtype="datetime64[D]")
+    fim = df["fim"].to_numpy(dtype="datetime64[D]")
+    valor_diario = df["valor_diario"].to_numpy(dtype=np.float64)
+
+    # uma linha por (faixa, mês) sem laço em Python
+    mes_ini = inicio.astype("datetime64[M]")
+    n_meses = (fim.astype("datetime64[M]") - mes_ini).astype(np.int64) + 1
+    faixa = np.repeat(np.arange(len(df)), n_meses)
+    deslocamento = np.arange(n_meses.sum()) - np.repeat(np.cumsum(n_meses) - n_meses, n_meses)
+    mes = mes_ini[faixa] + deslocamento
+
+    a = np.maximum(inicio[faixa], mes.astype("datetime64[D]"))
+    b = np.minimum(fim[faixa], (mes + 1).astype("datetime64[D]") - 1)
+    if dias_uteis:
+        anos = mes.astype("datetime64[Y]").astype(np.int64) + 1970
+        dias = np.busday_count(a, b + 1, holidays=feriados(int(anos.min()), int(anos.max()), calendario))
+    else:
+        dias = (b - a).astype(np.int64) + 1
+
+    detalhe = pd.DataFrame({
+        "caso": df["caso"].to_numpy()[faixa],
+        "mes": mes.astype(np.int64) + 1970 * 12,  # ordinal do mês (ver selic.py)
+        "dias": dias,
+        "valor": dias * valor_diario[faixa],
+    })
+    return detalhe.groupby(["caso", "mes"], as_index=False, sort=True).sum()
+
+
+def calcular_multas(faixas, atualizacao, dias_uteis=False, calendario="Brazil",
+                    metodo=SIMPLES, tabela=None):
+    """
+    Calcula as multas de todos os casos de uma vez.
+
+    `atualizacao` aceita os formatos de mês de selic.como_ordinal
+    ('2025-12', 'dez/25', date...). Retorna (detalhe, resumo):
+    - detalhe: caso, competência, dias, valor, juros (fração) e valor corrigido por mês
+    - resumo: totais por caso
+    """
+    tabela = tabela or tabela_correcao()
+    detalhe = expandir_por_mes(faixas, dias_uteis, calendario)
+    mes_atualizacao = como_ordinal(atualizacao)
+
+    juros = tabela.juros_sicalc_vetor(detalhe["mes"].to_numpy(), np.full(len(detalhe), mes_atualizacao), metodo)
+    detalhe["juros"] = juros
+    detalhe["valor_corrigido"] = (detalhe["valor"] * (1 + juros)).round(2)
+    detalhe["competencia"] = [formatar_mes(m) for m in detalhe["mes"]]
+    detalhe = detalhe[["caso", "competencia", "mes", "dias", "valor", "juros", "valor_corrigido"]]
+
+    resumo = detalhe.groupby("caso", as_index=False).agg(
+        meses=("mes", "size"),
+        dias=("dias", "sum"),
+        valor=("valor", "sum"),
+        # NaN quando algum mês depende de taxa SELIC ainda não publicada
+        valor_corrigido=("valor_corrigido", lambda v: v.sum(skipna=False)),
+        pendente_selic=("juros", lambda j: bool(np.isnan(j).any())),
+    )
+    return detalhe, resumo
+
+
+def processar_planilha(entrada, saida, atualizacao, dias_uteis=False, calendario="Brazil"):
+    """Lê a planilha de faixas (CSV ou XLSX) e grava Detalhe + Resumo em XLSX."""
+    if str(entrada).lower().endswith(".csv"):
+        faixas = pd.read_csv(entrada, sep=None, engine="python")
+    else:
+        faixas = pd.read_excel(entrada)
+    detalhe, resumo = calcular_multas(faixas, atualizacao, dias_uteis, calendario)
+    with pd.ExcelWriter(saida, engine="openpyxl") as writer:
+        resumo.to_excel(writer, index=False, sheet_name="Resumo")
+        detalhe.drop(columns=["mes"]).to_excel(writer, index=False, sheet_name="Detalhe")
+    return detalhe, resumo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cálculo de multa diária em lote com correção SELIC")
+    parser.add_argument("entrada", help="Planilha de faixas (CSV ou XLSX)")
+    parser.add_argument("saida", help="Planilha de resultado (XLSX)")
+    parser.add_argument("--atualizacao", required=True, help="Mês de atualização (AAAA-MM)")
+    parser.add_argument("--dias-uteis", action="store_true", help="Contar apenas dias úteis")
+    parser.add_argument("--calendario", default="Brazil", help="Calendário do workalendar (ex.: BrazilPernambuco)")
+    args = parser.parse_args()
+    _, resumo = processar_planilha(args.entrada, args.saida, args.atualizacao, args.dias_uteis, args.calendario)
+    print(resumo.to_string(index=False))
@@ -0,0 +1,184 @@
+"""
+Catálogo do repositório de links (catalogo.json) e montagem do HTML dos cartões.
+
+O catálogo tem duas listas de seções, "aplicacoes" (nossos projetos) e
+"links" (sistemas externos), cada seção com título e itens:
+
+    {"titulo": "...", "descricao": "...", "url": "https://...", "botao": "Acessar"}
+
+O HTML de cada aba é montado numa única passada, com <details>/<summary>
+no lugar dos st.expander, para ser emitido com uma só chamada st.markdown.
+
+A busca usa um índice invertido (IndiceBusca) montado uma vez sobre título,
+descrição e categoria de cada item, sem acentos e com casamento por prefixo.
+"""
+
+import html
+import json
+import os
+import re
+from bisect import bisect_left
+
+from unidecode import unidecode
+
+CAMINHO_CATALOGO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogo.json")
+
+
+def carregar_catalogo(caminho=CAMINHO_CATALOGO):
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def contagens(catalogo):
+    """Totais exibidos no rodapé e na barra lateral, calculados a partir dos dados."""
+    return {
+        "projetos": sum(len(s["itens"]) for s in catalogo["aplicacoes"]),
+        "links": sum(len(s["itens"]) for s in catalogo["links"]),
+        "categorias": len(catalogo["aplicacoes"]) + len(catalogo["links"]),
+    }
+
+
+def urls(catalogo):
+    """Todas as URLs do catálogo (aplicações e links externos), sem repetição."""
+    todas = [i["url"] for grupo in ("aplicacoes", "links") for s in catalogo[grupo] for i in s["itens"]]
+    return list(dict.fromkeys(todas))
+
+
+def selo_status(status):
+    """Selo HTML com o status de um item (ver verificador_status.Status)."""
+    if status is None:
+        return ""
+    if status.dormindo:
+        return '<span class="status-badge status-dormindo">💤 dormindo</span>'
+    if status.ok:
+        return f'<span class="status-badge status-ok">● {status.latencia_ms:.0f} ms</span>'
+    motivo = f"HTTP {status.codigo}" if status.codigo else (status.erro or "erro")
+    return f'<span class="status-badge status-erro">● fora do ar ({html.escape(motivo)})</span>'
+
+
+# Peso de cada campo na pontuação da busca
+PESOS_BUSCA = {"titulo": 3.0, "categoria": 2.0, "descricao": 1.0}
+BONUS_PALAVRA_INTEIRA = 0.5
+_RE_PALAVRA = re.compile(r"[a-z0-9]+")
+
+
+def termos(texto):
+    """Palavras do texto em minúsculas e sem acentos."""
+    return _RE_PALAVRA.findall(unidecode(texto).lower())
+
+
+class IndiceBusca:
+    """
+    Índice invertido do catálogo: palavra -> {item: peso}. O vocabulário
+    ordenado permite achar por bisect todas as palavras com um prefixo.
+    """
+
+    def __init__(self, catalogo):
+        self.itens = []  # (grupo, categoria, item)
+        postagens = {}
+        for grupo in ("aplicacoes", "links"):
+            for secao in catalogo[grupo]:
+                for item in secao["itens"]:
+                    ident = len(self.itens)
+                    self.itens.append((grupo, secao["titulo"], item))
+                    campos = {"titulo": item["titulo"], "categoria": secao["titulo"], "descricao": item["descricao"]}
+                    for campo, texto in campos.items():
+                        for palavra in termos(texto):
+                            pesos = postagens.setdefault(palavra, {})
+                            pesos[ident] = max(pesos.get(ident, 0.0), PESOS_BUSCA[campo])
+        self.postagens = postagens
+        self.vocabulario = sorted(postagens)
+
+    def _com_prefixo(self, prefixo):
+        i = bisect_left(self.vocabulario, prefixo)
+        while i < len(self.vocabulario) and self.vocabulario[i].startswith(prefixo):
+            yield self.vocabulario[i]
+            i += 1
+
+    def buscar(self, consulta, limite=20):
+        """
+        Itens que contêm todos os termos da consulta (cada termo como prefixo
+        de alguma palavra), do mais relevante ao menos relevante.
+        Retorna [(grupo, categoria, item)].
+        """
+        pontos = None
+        for termo in dict.fromkeys(termos(consulta)):
+            do_termo = {}
+            for palavra in self._com_prefixo(termo):
+                bonus = BONUS_PALAVRA_INTEIRA if palavra == termo else 0.0
+                for ident, peso in self.postagens[palavra].items():
+                    do_termo[ident] = max(do_termo.get(ident, 0.0), peso + bonus)
+            if pontos is None:
+                pontos = do_termo
+            else:
+                pontos = {i: p + do_termo[i] for i, p in pontos.items() if i in do_termo}
+            if not pontos:
+                return []
+        if pontos is None:
+            return []
+        ordem = sorted(pontos, key=lambda i: (-pontos[i], i))[:limite]
+        return [self.itens[i] for i in ordem]
+
+
+def _botao(item, padrao):
+    url = html.escape(item["url"], quote=True)
+    texto = html.escape(item.get("botao", padrao))
+    return f'<a href="{url}" target="_blank"><button class="link-button">{texto}</button></a>'
+
+
+def html_aplicacoes(secoes, selos=None):
+    """
+    Seções de aplicações: cartões recolhíveis em grade.
+    `selos` (opcional): {url: html do selo de status}.
+    """
+    selos = selos or {}
+    partes = []
+    for secao in secoes:
+        partes.append(f'<div class="section-title">{html.escape(secao["titulo"])}</div>')
+        partes.append('<div class="app-grid">')
+        for item in secao["itens"]:
+            partes.append(
+                '<details class="app-card">'
+                f'<summary class="app-title">{html.escape(item["titulo"])} {selos.get(item["url"], "")}</summary>'
+                f'<div class="description-box">{html.escape(item["descricao"])}</div>'
+                f'{_botao(item, "Acessar Ferramenta")}'
+                '</details>'
+            )
+        partes.append('</div>')
+    return "".join(partes)
+
+
+def html_links(secoes, selos=None):
+    """Seções de links externos: cartões sempre abertos, uma coluna por categoria."""
+    selos = selos or {}
+    partes = ['<div class="external-link-grid">']
+    for secao in secoes:
+        partes.append(f'<div><div class="link-category">{html.escape(secao["titulo"])}</div>')
+        for item in secao["itens"]:
+            partes.append(
+                '<div class="external-link-card">'
+                f'<strong>{html.escape(item["titulo"])}</strong> {selos.get(item["url"], "")}'
+                f'<div class="description-box">{html.escape(item["descricao"])}</div>'
+                f'{_botao(item, "Acessar Sistema")}'
+                '</div>'
+            )
+        partes.append('</div>')
+    partes.append('</div>')
+    return "".join(partes)
+
+
+def html_resultados(resultados, selos=None):
+    """Resultados da busca como cartões abertos, com a categoria de cada item."""
+    selos = selos or {}
+    partes = []
+    for grupo, categoria, item in resultados:
+        padrao = "Acessar Ferramenta" if grupo == "aplicacoes" else "Acessar Sistema"
+        partes.append(
+            '<div class="external-link-card">'
+            f'<strong>{html.escape(item["titulo"])}</strong> {selos.get(item["url"], "")}'
+            f'<div class="search-category">{html.escape(categoria)}</div>'
+            f'<div class="description-box">{html.escape(item["descricao"])}</div>'
+            f'{_botao(item, padrao)}'
+            '</div>'
+        )
+    return "".join(partes)
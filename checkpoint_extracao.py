@@ -0,0 +1,147 @@
+"""
+Checkpoints de extração de PDFs longos (retomada após queda ou rerun).
+
+As linhas extraídas são gravadas num SQLite local por faixa de páginas,
+identificadas pelo hash do arquivo (e pelo modo de extração). Se a sessão
+cair, a aba reconectar ou o contêiner reiniciar no meio da leitura, a
+próxima execução com o mesmo arquivo continua da primeira página ainda não
+gravada; quando a extração termina, as reexecuções leem só o checkpoint.
+Os erros de página de cada bloco são gravados junto com as linhas, para
+serem mostrados também depois de uma retomada ou de um rerun.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+
+VALIDADE_PADRAO = 7 * 24 * 3600  # segundos
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocos (
+    chave TEXT NOT NULL,
+    pagina_inicio INTEGER NOT NULL,
+    pagina_fim INTEGER NOT NULL,
+    linhas TEXT NOT NULL,
+    erros TEXT NOT NULL DEFAULT '[]',
+    gravado_em REAL NOT NULL,
+    PRIMARY KEY (chave, pagina_inicio)
+);
+CREATE TABLE IF NOT EXISTS extracoes (
+    chave TEXT PRIMARY KEY,
+    total_paginas INTEGER NOT NULL,
+    concluida INTEGER NOT NULL DEFAULT 0,
+    atualizado_em REAL NOT NULL
+);
+"""
+
+
+def hash_arquivo(conteudo):
+    """SHA-256 do conteúdo do arquivo (bytes)."""
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+class CheckpointExtracao:
+    """
+    Progresso de extrações por chave (hash do arquivo + modo).
+
+    As páginas são numeradas a partir de 0 e cada bloco cobre
+    [pagina_inicio, pagina_fim); proxima_pagina() devolve onde retomar.
+    """
+
+    def __init__(self, caminho_db, validade=VALIDADE_PADRAO):
+        self.caminho_db = caminho_db
+        self.validade = validade
+        with self._conectar() as conn:
+            conn.executescript(SCHEMA)
+            colunas = [c[1] for c in conn.execute("PRAGMA table_info(blocos)")]
+            if "erros" not in colunas:
+                # checkpoints criados antes do registro dos erros
+                conn.execute("ALTER TABLE blocos ADD COLUMN erros TEXT NOT NULL DEFAULT '[]'")
+
+    @contextmanager
+    def _conectar(self):
+        conn = sqlite3.connect(self.caminho_db, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def iniciar(self, chave, total_paginas):
+        """Registra a extração (se ainda não existir) e devolve a página de retomada."""
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO extracoes (chave, total_paginas, atualizado_em) VALUES (?, ?, ?)",
+                (chave, total_paginas, time.time())
+            )
+        return self.proxima_pagina(chave)
+
+    def proxima_pagina(self, chave):
+        with self._conectar() as conn:
+            (fim,) = conn.execute("SELECT MAX(pagina_fim) FROM blocos WHERE chave = ?", (chave,)).fetchone()
+        return fim or 0
+
+    def progresso(self, chave):
+        """(páginas já gravadas, total de páginas); total 0 se a extração não começou."""
+        with self._conectar() as conn:
+            linha = conn.execute("SELECT total_paginas FROM extracoes WHERE chave = ?", (chave,)).fetchone()
+        return self.proxima_pagina(chave), (linha[0] if linha else 0)
+
+    def concluida(self, chave):
+        with self._conectar() as conn:
+            linha = conn.execute("SELECT concluida FROM extracoes WHERE chave = ?", (chave,)).fetchone()
+        return bool(linha and linha[0])
+
+    def salvar_bloco(self, chave, pagina_inicio, pagina_fim, linhas, erros=()):
+        """
+        Grava as linhas extraídas das páginas [pagina_inicio, pagina_fim) e os
+        erros [(página, mensagem)] das páginas que não puderam ser lidas.
+        """
+        agora = time.time()
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO blocos (chave, pagina_inicio, pagina_fim, linhas, erros, gravado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (chave, pagina_inicio, pagina_fim, json.dumps(linhas, ensure_ascii=False),
+                 json.dumps(list(erros), ensure_ascii=False), agora)
+            )
+            conn.execute("UPDATE extracoes SET atualizado_em = ? WHERE chave = ?", (agora, chave))
+
+    def concluir(self, chave):
+        with self._conectar() as conn:
+            conn.execute(
+                "UPDATE extracoes SET concluida = 1, atualizado_em = ? WHERE chave = ?", (time.time(), chave)
+            )
+
+    def linhas(self, chave):
+        """Todas as linhas gravadas, na ordem das páginas."""
+        with self._conectar() as conn:
+            blocos = conn.execute(
+                "SELECT linhas FROM blocos WHERE chave = ? ORDER BY pagina_inicio", (chave,)
+            ).fetchall()
+        return [linha for (bloco,) in blocos for linha in json.loads(bloco)]
+
+    def erros(self, chave):
+        """Erros [(página, mensagem)] gravados, na ordem das páginas."""
+        with self._conectar() as conn:
+            blocos = conn.execute(
+                "SELECT erros FROM blocos WHERE chave = ? ORDER BY pagina_inicio", (chave,)
+            ).fetchall()
+        return [tuple(erro) for (bloco,) in blocos for erro in json.loads(bloco)]
+
+    def descartar(self, chave):
+        """Apaga o checkpoint (para extrair o arquivo de novo do início)."""
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM blocos WHERE chave = ?", (chave,))
+            conn.execute("DELETE FROM extracoes WHERE chave = ?", (chave,))
+
+    def limpar_antigos(self):
+        """Remove extrações sem atualização dentro da validade."""
+        limite = time.time() - self.validade
+        with self._conectar() as conn:
+            antigas = [c for (c,) in conn.execute("SELECT chave FROM extracoes WHERE atualizado_em < ?", (limite,))]
+            conn.executemany("DELETE FROM blocos WHERE chave = ?", [(c,) for c in antigas])
+            conn.executemany("DELETE FROM extracoes WHERE chave = ?", [(c,) for c in antigas])
+        return len(antigas)
@@ -0,0 +1,151 @@
+"""
+Correção monetária pela SELIC com fatores acumulados pré-calculados.
+
+A partir da série mensal (selic.py) são montados, uma única vez, os
+acumulados prefixados:
+
+    soma[k]    = taxa[0] + ... + taxa[k-1]
+    produto[k] = (1 + taxa[0]) * ... * (1 + taxa[k-1])
+
+Assim, o acumulado de qualquer período [a, b] é uma subtração
+(soma[b+1] - soma[a]) ou uma divisão (produto[b+1] / produto[a]), e milhares
+de correções são feitas numa única operação NumPy. Meses sem taxa (NaN) são
+contados em `faltando`, com o mesmo prefixo: só os períodos que incluem algum
+deles resultam em NaN.
+
+Regra do Sicalc (Receita Federal) para juros de mora pela SELIC: soma simples
+das taxas mensais do mês seguinte ao vencimento até o mês anterior ao
+pagamento, mais 1% no mês do pagamento; pagamento no próprio mês do
+vencimento não tem juros. Exemplo com as taxas de selic.csv (fev/2024 = 0,80%
+e mar/2024 = 0,83%):
+
+    >>> tabela = tabela_correcao()
+    >>> round(tabela.juros_sicalc("jan/2024", "abr/2024"), 6)
+    0.0263
+    >>> round(tabela.juros_sicalc("jan/2024", "fev/2024"), 6)
+    0.01
+    >>> tabela.juros_sicalc("jan/2024", "jan/2024")
+    0.0
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from selic import SerieSelic, carregar_serie, como_ordinal, formatar_mes
+
+SIMPLES = "simples"
+COMPOSTO = "composto"
+TAXA_MES_PAGAMENTO = 0.01  # 1% no mês do pagamento (regra do Sicalc)
+
+
+def ordinais(meses):
+    """
+    Converte uma coleção de meses em array de ordinais (ano * 12 + mês - 1).
+    Arrays datetime64 (ou Series de datas) são convertidos de forma vetorizada.
+    """
+    arr = np.asarray(meses)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype("datetime64[M]").astype(np.int64) + 1970 * 12
+    if np.issubdtype(arr.dtype, np.integer):
+        return arr.astype(np.int64)
+    return np.fromiter((como_ordinal(m) for m in arr.ravel()), dtype=np.int64, count=arr.size).reshape(arr.shape)
+
+
+@dataclass(frozen=True, eq=False)
+class TabelaCorrecao:
+    """Série SELIC + acumulados prefixados (soma simples, produto composto e meses sem taxa)."""
+
+    serie: SerieSelic
+    soma: np.ndarray
+    produto: np.ndarray
+    faltando: np.ndarray
+
+    def _posicoes(self, meses, fim_exclusivo=False):
+        """
+        Posições dos meses nos acumulados. Meses anteriores ao início da série
+        são erro; meses após o fim são limitados ao fim e indicados em `apos`
+        (o resultado correspondente vira NaN, como taxa não publicada).
+        """
+        ords = ordinais(meses)
+        pos = ords - self.serie.inicio
+        if np.any(pos < 0):
+            primeiro = int(np.min(ords))
+            raise ValueError(f"Mês {formatar_mes(primeiro)} anterior ao início da série SELIC")
+        limite = len(self.serie.taxas) - (0 if fim_exclusivo else 1)
+        apos = pos > limite
+        return np.minimum(pos, limite), apos
+
+    def _acumulado(self, a, b, metodo):
+        # acumulado das taxas nas posições [a, b) (vazio quando b <= a)
+        b = np.maximum(a, b)
+        if metodo == SIMPLES:
+            acumulado = self.soma[b] - self.soma[a]
+        elif metodo == COMPOSTO:
+            acumulado = self.produto[b] / self.produto[a] - 1
+        else:
+            raise ValueError(f"Método de acumulação inválido: {metodo!r}")
+        return np.where(self.faltando[b] > self.faltando[a], np.nan, acumulado)
+
+    def fatores_periodo(self, inicios, fins, metodo=COMPOSTO):
+        """Fatores de correção (1 + acumulado) de `inicio` a `fim`, inclusive."""
+        a, apos_a = self._posicoes(inicios)
+        b, apos_b = self._posicoes(fins)
+        return np.where(apos_a | apos_b, np.nan, 1 + self._acumulado(a, b + 1, metodo))
+
+    def fator_periodo(self, inicio, fim, metodo=COMPOSTO):
+        return float(self.fatores_periodo(inicio, fim, metodo))
+
+    def juros_sicalc_vetor(self, vencimentos, pagamentos, metodo=SIMPLES):
+        """
+        Juros de mora (fração) pela regra do Sicalc para vários pares
+        vencimento/pagamento. NaN indica período com taxa ainda não publicada.
+        """
+        v, apos_v = self._posicoes(vencimentos)
+        p, apos_p = self._posicoes(pagamentos, fim_exclusivo=True)
+        juros = self._acumulado(np.minimum(v + 1, p), p, metodo)
+        if metodo == SIMPLES:
+            juros = juros + TAXA_MES_PAGAMENTO
+        else:
+            juros = (1 + juros) * (1 + TAXA_MES_PAGAMENTO) - 1
+        juros = np.where(apos_p, np.nan, juros)
+        sem_juros = ordinais(pagamentos) <= ordinais(vencimentos)
+        return np.where(sem_juros, 0.0, juros)
+
+    def juros_sicalc(self, vencimento, pagamento, metodo=SIMPLES):
+        juros = float(self.juros_sicalc_vetor(vencimento, pagamento, metodo))
+        if np.isnan(juros):
+            raise ValueError(
+                f"Taxa SELIC ainda não publicada entre {formatar_mes(vencimento)} e {formatar_mes(pagamento)}"
+            )
+        return juros
+
+    def corrigir(self, valores, vencimentos, pagamentos, metodo=SIMPLES):
+        """
+        Corrige vários valores de uma vez: valor * (1 + juros Sicalc).
+        Todos os argumentos podem ser arrays/Series do mesmo tamanho.
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        return valores * (1 + self.juros_sicalc_vetor(vencimentos, pagamentos, metodo))
+
+
+def montar_tabela(serie):
+    """Pré-calcula os acumulados da série (placeholders contados à parte, em `faltando`)."""
+    taxas = serie.taxas
+    soma = np.concatenate(([0.0], np.nancumsum(taxas)))
+    produto = np.concatenate(([1.0], np.nancumprod(1 + taxas)))
+    faltando = np.concatenate(([0], np.cumsum(np.isnan(taxas))))
+    for array in (soma, produto, faltando):
+        array.setflags(write=False)
+    return TabelaCorrecao(serie=serie, soma=soma, produto=produto, faltando=faltando)
+
+
+@lru_cache(maxsize=8)
+def _tabela_da_serie(serie):
+    return montar_tabela(serie)
+
+
+def tabela_correcao(caminho=None):
+    """Tabela de correção da série do arquivo (calculada uma vez por série carregada)."""
+    return _tabela_da_serie(carregar_serie(caminho))
@@ -0,0 +1,259 @@
+"""
+Busca de rubricas no HISCRE (Histórico de Créditos do INSS).
+
+As tabelas de cada PDF são lidas com tabelas_pdf.extract_tables_from_pdf e
+normalizadas numa tabela longa, uma linha por lançamento:
+
+    arquivo | competencia (datetime64, 1º dia do mês) | rubrica | descricao | valor
+
+As colunas são reconhecidas pelo nome (Competência, Rubrica, Descrição,
+Valor) ou, nas tabelas sem cabeçalho, pelo conteúdo (MM/AAAA, código de 3 a 5
+dígitos, valor no formato 1.234,56). Quando a competência aparece só na
+primeira linha do bloco, ela é repetida nas linhas seguintes.
+
+IndiceRubricas monta, uma única vez, um índice invertido rubrica -> posições
+na tabela (já ordenada por competência); qualquer número de rubricas é
+consultado em vários arquivos sem percorrer a tabela de novo.
+
+Linha de comando:
+
+    python hiscre.py hiscre1.pdf hiscre2.pdf --rubricas 101 104 --saida resultado.xlsx
+"""
+
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from unidecode import unidecode
+
+from tabelas_pdf import extract_tables_from_pdf
+
+TIPOS_LANCAMENTOS = {
+    "arquivo": str,
+    "competencia": "datetime64[ns]",
+    "rubrica": str,
+    "descricao": str,
+    "valor": float,
+}
+
+RE_COMPETENCIA = re.compile(r"\b(0?[1-9]|1[0-2])/((?:19|20)\d{2})\b")
+RE_RUBRICA = r"^\d{3,5}$"
+RE_RUBRICA_DESCRICAO = r"^(\d{3,5})\s+(.+)$"
+RE_VALOR = r"^\(?-?\s*(?:R\$)?\s*-?\d{1,3}(?:\.?\d{3})*,\d{2}\s*-?\)?$"
+# Fração mínima de células compatíveis para reconhecer a coluna pelo conteúdo
+LIMIAR_CONTEUDO = 0.6
+
+
+def _nome_normalizado(nome):
+    return unidecode(str(nome)).lower()
+
+
+def _fracao_compativel(coluna, padrao):
+    valores = coluna.dropna().astype(str).str.strip()
+    valores = valores[valores != ""]
+    if valores.empty:
+        return 0.0
+    return valores.str.match(padrao).mean()
+
+
+def encontrar_colunas(df, pelo_nome=True):
+    """
+    Colunas de competência, rubrica, descrição e valor da tabela
+    ({papel: nome da coluna ou None}), pelo nome (só se o cabeçalho for do
+    PDF, não gerado) e, se preciso, pelo conteúdo.
+    """
+    papeis = {"competencia": None, "rubrica": None, "descricao": None, "valor": None}
+    for coluna in (df.columns if pelo_nome else []):
+        nome = _nome_normalizado(coluna)
+        if papeis["competencia"] is None and "compet" in nome:
+            papeis["competencia"] = coluna
+        elif papeis["descricao"] is None and "descr" in nome:
+            papeis["descricao"] = coluna
+        elif papeis["rubrica"] is None and ("rubrica" in nome or nome.startswith("cod")):
+            papeis["rubrica"] = coluna
+        elif papeis["valor"] is None and "valor" in nome:
+            papeis["valor"] = coluna
+
+    usadas = {c for c in papeis.values() if c is not None}
+    por_conteudo = [
+        ("competencia", r"^(0?[1-9]|1[0-2])/\d{4}$"),
+        ("rubrica", RE_RUBRICA),
+        ("valor", RE_VALOR),
+    ]
+    if papeis["rubrica"] is None and papeis["descricao"] is None:
+        # código e descrição na mesma célula
+        por_conteudo.insert(2, ("descricao", RE_RUBRICA_DESCRICAO))
+    for papel, padrao in por_conteudo:
+        if papeis[papel] is not None:
+            continue
+        fracoes = {c: _fracao_compativel(df[c], padrao) for c in df.columns if c not in usadas}
+        if fracoes:
+            melhor = max(fracoes, key=fracoes.get)
+            if fracoes[melhor] >= LIMIAR_CONTEUDO:
+                papeis[papel] = melhor
+                usadas.add(melhor)
+    return papeis
+
+
+def valores_brasileiros(coluna):
+    """
+    Converte valores como 'R$ 1.234,56' para float (NaN se inválido). São
+    negativos '-12,00', 'R$ -12,00', '12,00-' e '(12,00)'.
+    """
+    texto = coluna.astype(str).str.strip()
+    # sinal antes ou depois do prefixo R$, sinal no fim ou valor entre parênteses
+    negativo = texto.str.contains(r"^(?:R\$\s*)?-|-$|^\(.*\)$", regex=True)
+    numeros = texto.str.replace(r"[^\d,]", "", regex=True).str.replace(",", ".", regex=False)
+    valores = pd.to_numeric(numeros, errors="coerce")
+    return valores.where(~negativo, -valores)
+
+
+def _competencias(df, coluna):
+    # competência da coluna própria ou, na falta dela, da primeira célula MM/AAAA da linha
+    if coluna is not None:
+        texto = df[coluna].astype(str)
+    else:
+        texto = df.astype(str).agg(" ".join, axis=1)
+    partes = texto.str.extract(RE_COMPETENCIA)
+    return pd.to_datetime(
+        partes[1] + "-" + partes[0].str.zfill(2) + "-01", format="%Y-%m-%d", errors="coerce"
+    )
+
+
+def lancamentos_da_tabela(df, pelo_nome=True):
+    """
+    Lançamentos (competencia, rubrica, descricao, valor) de uma tabela do HISCRE.
+    Competências ausentes ficam NaT e são preenchidas por quem chama.
+    Retorna None se a tabela não tiver rubricas e valores.
+    """
+    papeis = encontrar_colunas(df, pelo_nome)
+    if papeis["valor"] is None:
+        return None
+
+    if papeis["rubrica"] is not None:
+        rubrica = df[papeis["rubrica"]].astype(str).str.strip()
+        descricao = df[papeis["descricao"]].astype(str).str.strip() if papeis["descricao"] is not None else ""
+    elif papeis["descricao"] is not None:
+        # código e descrição na mesma célula ("101 VALOR TOTAL DE MR DO PERIODO")
+        partes = df[papeis["descricao"]].astype(str).str.strip().str.extract(RE_RUBRICA_DESCRICAO)
+        rubrica, descricao = partes[0], partes[1]
+    else:
+        return None
+
+    lancamentos = pd.DataFrame({
+        "competencia": _competencias(df, papeis["competencia"]),
+        "rubrica": rubrica,
+        "descricao": descricao,
+        "valor": valores_brasileiros(df[papeis["valor"]]),
+    })
+    return lancamentos
+
+
+def lancamentos_vazios():
+    return pd.DataFrame({coluna: pd.Series(dtype=tipo) for coluna, tipo in TIPOS_LANCAMENTOS.items()})
+
+
+def lancamentos_hiscre(pdf_file, arquivo=None, on_error=None):
+    """
+    Tabela longa de lançamentos de um PDF do HISCRE.
+
+    As tabelas repetidas não são agrupadas (deduplicate=False): meses com os
+    mesmos créditos geram tabelas idênticas que precisam ser mantidas.
+    Erros de leitura das páginas vão para `on_error(mensagem)`.
+    """
+    arquivo = arquivo or os.path.basename(getattr(pdf_file, "name", str(pdf_file)))
+    partes = []
+    for record in extract_tables_from_pdf(pdf_file, deduplicate=False, on_error=on_error):
+        lancamentos = lancamentos_da_tabela(record.data, pelo_nome=record.has_header)
+        if lancamentos is not None:
+            partes.append(lancamentos)
+    if not partes:
+        return lancamentos_vazios()
+
+    lancamentos = pd.concat(partes, ignore_index=True)
+    # a competência vale para as linhas seguintes do bloco (inclusive na página seguinte)
+    lancamentos["competencia"] = lancamentos["competencia"].ffill()
+    validos = (
+        lancamentos["competencia"].notna()
+        & lancamentos["valor"].notna()
+        & lancamentos["rubrica"].fillna("").str.fullmatch(RE_RUBRICA)
+    )
+    lancamentos = lancamentos[validos]
+    lancamentos.insert(0, "arquivo", arquivo)
+    return lancamentos.reset_index(drop=True)
+
+
+class IndiceRubricas:
+    """Índice invertido rubrica -> posições dos lançamentos, em ordem cronológica."""
+
+    def __init__(self, lancamentos):
+        if isinstance(lancamentos, (list, tuple)):
+            lancamentos = [l for l in lancamentos if not l.empty]
+            lancamentos = pd.concat(lancamentos, ignore_index=True) if lancamentos else None
+        if lancamentos is None or lancamentos.empty:
+            lancamentos = lancamentos_vazios()
+        self.lancamentos = lancamentos.sort_values(
+            ["competencia", "arquivo", "rubrica"], kind="stable"
+        ).reset_index(drop=True)
+        self.posicoes = {
+            str(rubrica): np.asarray(pos)
+            for rubrica, pos in self.lancamentos.groupby("rubrica", sort=False).indices.items()
+        }
+
+    def rubricas(self):
+        """Rubricas disponíveis: código, descrição mais frequente e quantidade de lançamentos."""
+        if self.lancamentos.empty:
+            return pd.DataFrame(columns=["rubrica", "descricao", "lancamentos"])
+        return (self.lancamentos.groupby("rubrica")
+                .agg(descricao=("descricao", lambda d: d.mode().iat[0] if d.notna().any() else ""),
+                     lancamentos=("valor", "size"))
+                .reset_index())
+
+    def buscar(self, rubricas, inicio=None, fim=None):
+        """
+        Lançamentos das rubricas pedidas, em ordem cronológica.
+        `inicio`/`fim` (opcionais) limitam as competências (datas ou 'AAAA-MM').
+        """
+        pos = [self.posicoes[str(r).strip()] for r in rubricas if str(r).strip() in self.posicoes]
+        if not pos:
+            return self.lancamentos.iloc[0:0]
+        # posições crescentes = ordem cronológica (a tabela já está ordenada)
+        resultado = self.lancamentos.take(np.sort(np.concatenate(pos)))
+        if inicio is not None:
+            resultado = resultado[resultado["competencia"] >= pd.Timestamp(inicio)]
+        if fim is not None:
+            resultado = resultado[resultado["competencia"] <= pd.Timestamp(fim)]
+        return resultado.reset_index(drop=True)
+
+    def tabela_por_competencia(self, rubricas, **filtros):
+        """Valores das rubricas pedidas lado a lado, uma linha por arquivo e competência."""
+        resultado = self.buscar(rubricas, **filtros)
+        return resultado.pivot_table(
+            index=["arquivo", "competencia"], columns="rubrica", values="valor", aggfunc="sum"
+        ).reset_index()
+
+
+def indexar_arquivos(arquivos):
+    """Índice de rubricas de vários PDFs do HISCRE."""
+    return IndiceRubricas([lancamentos_hiscre(a) for a in arquivos])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Busca de rubricas em PDFs do HISCRE")
+    parser.add_argument("arquivos", nargs="+", help="PDFs do HISCRE")
+    parser.add_argument("--rubricas", nargs="*", help="Códigos das rubricas (sem informar, lista as disponíveis)")
+    parser.add_argument("--saida", help="Planilha de resultado (XLSX)")
+    args = parser.parse_args()
+
+    indice = indexar_arquivos(args.arquivos)
+    if not args.rubricas:
+        print(indice.rubricas().to_string(index=False))
+    else:
+        resultado = indice.buscar(args.rubricas)
+        if args.saida:
+            with pd.ExcelWriter(args.saida, engine="openpyxl") as writer:
+                resultado.to_excel(writer, index=False, sheet_name="Lancamentos")
+                indice.tabela_por_competencia(args.rubricas).to_excel(writer, index=False, sheet_name="Por_Competencia")
+        print(resultado.to_string(index=False))
@@ -0,0 +1,256 @@
+"""
+Extração da lista de medalhistas (Aluno, Data nascimento, Estado, Nível,
+Medalha) de PDFs com texto copiável, sem dependência do Streamlit, para ser
+usada pelo app relacionar_medalhistas.py e por processos de trabalho.
+
+rows_to_frame monta o resultado numa única passada já em formato compacto:
+categorias para Estado/Nível/Medalha (poucos valores distintos), datetime64
+para a data de nascimento e strings Arrow para os nomes. Datas que não
+podem ser lidas (31/02/2010) ficam NaT, com o texto original guardado em
+RAW_DATE_COLUMN para que essas linhas possam ser listadas e comparadas.
+
+Dois modos: "colunas" (posição x das palavras, limites aprendidos do
+cabeçalho) e "texto" (heurística por espaços sobre extract_text). O
+progresso é gravado em checkpoints (checkpoint_extracao.py) a cada
+PAGES_PER_CHECKPOINT páginas, o que permite retomar a extração e
+acompanhar, de outro processo, quantas páginas já foram lidas.
+
+O pdfplumber só é importado ao extrair: o app que lê linhas já gravadas no
+checkpoint, ou compara nomes, inicia sem ele.
+"""
+
+import io
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from checkpoint_extracao import CheckpointExtracao, hash_arquivo
+
+PAGES_PER_CHECKPOINT = 10
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    STRING_DTYPE = pd.StringDtype()
+
+COLUMNS = ["Aluno", "Data nascimento", "Estado", "Nível", "Medalha"]
+# Primeira palavra (sem acento, minúscula) do título de cada coluna no cabeçalho
+HEADER_KEYWORDS = ["aluno", "data", "estado", "nivel", "medalha"]
+# Colunas com poucos valores distintos, guardadas como categorias
+CATEGORY_COLUMNS = ["Estado", "Nível", "Medalha"]
+DATE_FORMAT = "%d/%m/%Y"
+# Texto original da data de nascimento, preenchido só onde a data é inválida
+RAW_DATE_COLUMN = "Data nascimento (texto)"
+# Diferença máxima de altura (pontos) entre palavras da mesma linha
+LINE_TOLERANCE = 3
+# Folga (pontos) à esquerda do título de cada coluna
+COLUMN_MARGIN = 1
+
+def strip_accents(text: str) -> str:
+    if not isinstance(text, str):
+        return text
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return text
+
+def normalize_name(name):
+    """Nome para comparação: sem acentos, maiúsculo e com espaços únicos."""
+    return " ".join(strip_accents(name).upper().split())
+
+def parse_table_rows_from_text(text: str):
+    """Heurística simples: extrai linhas contendo datas (formato dd/mm/aaaa)."""
+    rows = []
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    date_re = re.compile(r'\d{1,2}/\d{1,2}/\d{4}')
+    for ln in lines:
+        # ignorar cabeçalhos
+        if re.search(r'MEDALHISTAS|ALUNO|Data nascimento|Nível|Medalha', ln, re.IGNORECASE):
+            continue
+        m = date_re.search(ln)
+        if m:
+            name = ln[:m.start()].strip()
+            date = m.group().strip()
+            rest = ln[m.end():].strip()
+            parts = rest.split()
+            estado = parts[0] if len(parts) >= 1 else ""
+            nivel = parts[1] if len(parts) >= 2 else ""
+            medalha = parts[2] if len(parts) >= 3 else ""
+            rows.append({
+                "Aluno": name,
+                "Data nascimento": date,
+                "Estado": estado,
+                "Nível": nivel,
+                "Medalha": medalha
+            })
+    return rows
+
+def group_lines(tops, tolerance=LINE_TOLERANCE):
+    """Número da linha de cada palavra, agrupando alturas (top) próximas."""
+    order = np.argsort(tops, kind="stable")
+    sorted_tops = tops[order]
+    line_of_sorted = np.cumsum(np.diff(sorted_tops, prepend=sorted_tops[:1]) > tolerance)
+    lines = np.empty_like(line_of_sorted)
+    lines[order] = line_of_sorted
+    return lines
+
+def learn_column_bands(words):
+    """
+    Limites x entre as colunas, aprendidos da linha de cabeçalho
+    (Aluno | Data nascimento | Estado | Nível | Medalha). Cada limite fica no
+    início do título da coluna seguinte; como as palavras são classificadas
+    pelo centro, isso vale para colunas alinhadas à esquerda (nomes longos
+    que passam do título) e centralizadas. Retorna None se a página não
+    tiver o cabeçalho.
+    """
+    if not words:
+        return None
+    tops = np.array([w["top"] for w in words])
+    lines = group_lines(tops)
+    for line in np.unique(lines):
+        line_words = sorted((words[i] for i in np.flatnonzero(lines == line)), key=lambda w: w["x0"])
+        texts = [strip_accents(w["text"]).lower() for w in line_words]
+        starts = []
+        position = 0
+        for keyword in HEADER_KEYWORDS:
+            try:
+                position = texts.index(keyword, position)
+            except ValueError:
+                break
+            starts.append(position)
+        if len(starts) != len(HEADER_KEYWORDS):
+            continue
+        return np.array([line_words[i]["x0"] - COLUMN_MARGIN for i in starts[1:]])
+    return None
+
+def parse_rows_from_words(words, bounds):
+    """
+    Distribui as palavras da página nas colunas pela posição x (searchsorted
+    sobre os limites) e monta uma linha por altura. Só ficam as linhas com
+    data de nascimento válida (cabeçalhos e títulos são descartados).
+    """
+    if not words:
+        return []
+    x0 = np.array([w["x0"] for w in words])
+    x1 = np.array([w["x1"] for w in words])
+    tops = np.array([w["top"] for w in words])
+    table = pd.DataFrame({
+        "line": group_lines(tops),
+        "col": np.searchsorted(bounds, (x0 + x1) / 2, side="right"),
+        "x0": x0,
+        "text": [w["text"] for w in words],
+    })
+    cells = (table.sort_values(["line", "x0"], kind="stable")
+             .groupby(["line", "col"])["text"].agg(" ".join)
+             .unstack()
+             .reindex(columns=range(len(COLUMNS))))
+    cells.columns = COLUMNS
+    has_date = cells["Data nascimento"].fillna("").str.fullmatch(r"\d{1,2}/\d{1,2}/\d{4}")
+    return cells[has_date].fillna("").to_dict("records")
+
+def rows_to_frame(rows, sources=None):
+    """
+    DataFrame compacto a partir das linhas extraídas (dicts), numa única
+    passada: valores sem espaços nas pontas, linhas sem nome descartadas,
+    Aluno_normalizado calculado junto. `sources` (opcional, um por linha)
+    vira a coluna categórica "Arquivo". Datas inválidas viram NaT e mantêm
+    o texto em RAW_DATE_COLUMN (vazia nas demais linhas).
+    """
+    names, normalized, dates, files = [], [], [], []
+    categories = {col: [] for col in CATEGORY_COLUMNS}
+    for i, row in enumerate(rows):
+        name = (row.get("Aluno") or "").strip()
+        if not name:
+            continue
+        names.append(name)
+        normalized.append(normalize_name(name))
+        dates.append((row.get("Data nascimento") or "").strip())
+        for col in CATEGORY_COLUMNS:
+            categories[col].append((row.get(col) or "").strip())
+        if sources is not None:
+            files.append(sources[i])
+
+    data = {}
+    if sources is not None:
+        data["Arquivo"] = pd.Categorical(files)
+    data["Aluno"] = pd.array(names, dtype=STRING_DTYPE)
+    raw_dates = pd.Series(dates, dtype=object)
+    data["Data nascimento"] = pd.to_datetime(raw_dates, format=DATE_FORMAT, errors="coerce")
+    data[RAW_DATE_COLUMN] = pd.array(raw_dates.where(data["Data nascimento"].isna()), dtype=STRING_DTYPE)
+    for col in CATEGORY_COLUMNS:
+        data[col] = pd.Categorical(categories[col])
+    data["Aluno_normalizado"] = pd.array(normalized, dtype=STRING_DTYPE)
+    return pd.DataFrame(data)
+
+def memory_usage_mb(df):
+    """Memória ocupada pelo DataFrame (MB), incluindo o conteúdo das strings."""
+    return df.memory_usage(deep=True).sum() / 2**20
+
+def extraction_key(content, mode):
+    return f"{hash_arquivo(content)}:{mode}"
+
+def extract_page_rows(page, mode, bounds):
+    """Linhas de uma página. No modo colunas, devolve também os limites (aprendidos no 1º cabeçalho)."""
+    if mode == "colunas":
+        words = page.extract_words()
+        if bounds is None:
+            bounds = learn_column_bands(words)
+        if bounds is not None:
+            return parse_rows_from_words(words, bounds), bounds
+    # modo texto, ou página anterior a qualquer cabeçalho
+    return parse_table_rows_from_text(page.extract_text() or ""), bounds
+
+def extract_pdf_rows(content, mode, checkpoint_db, on_progress=None):
+    """
+    Extrai o PDF (bytes) gravando as linhas no checkpoint, a partir da
+    primeira página ainda não gravada. `on_progress(paginas_lidas, total)`
+    é chamado a cada página. Os erros de página são gravados no checkpoint
+    com cada bloco; retorna todos eles [(página, mensagem)], inclusive os de
+    blocos gravados antes de uma retomada.
+    """
+    import pdfplumber
+
+    checkpoint = CheckpointExtracao(checkpoint_db)
+    key = extraction_key(content, mode)
+    if checkpoint.concluida(key):
+        return checkpoint.erros(key)
+
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        total_pages = len(pdf.pages)
+        start = checkpoint.iniciar(key, total_pages)
+        bounds = None
+        if mode == "colunas" and start:
+            # retomada: limites das colunas a partir do cabeçalho da 1ª página
+            bounds = learn_column_bands(pdf.pages[0].extract_words())
+
+        for block_start in range(start, total_pages, PAGES_PER_CHECKPOINT):
+            block_end = min(block_start + PAGES_PER_CHECKPOINT, total_pages)
+            block_rows, block_errors = [], []
+            for i in range(block_start, block_end):
+                try:
+                    rows, bounds = extract_page_rows(pdf.pages[i], mode, bounds)
+                    block_rows.extend(rows)
+                except Exception as e:
+                    block_errors.append((i + 1, str(e)))
+                if on_progress is not None:
+                    on_progress(i + 1, total_pages)
+            checkpoint.salvar_bloco(key, block_start, block_end, block_rows, block_errors)
+
+    checkpoint.concluir(key)
+    return checkpoint.erros(key)
+
+if __name__ == "__main__":
+    # Processo de trabalho: extrai um PDF para o checkpoint e imprime os erros (JSON)
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Extrai a lista de medalhistas de um PDF para o checkpoint")
+    parser.add_argument("arquivo", help="PDF com texto copiável")
+    parser.add_argument("--modo", default="colunas", choices=["colunas", "texto"])
+    parser.add_argument("--checkpoint", required=True, help="Banco SQLite dos checkpoints")
+    args = parser.parse_args()
+
+    with open(args.arquivo, "rb") as f:
+        print(json.dumps(extract_pdf_rows(f.read(), args.modo, args.checkpoint), ensure_ascii=False))
@@ -0,0 +1,136 @@
+"""
+Tempo de importação dos apps e módulos do repositório (python -X importtime).
+
+Cada alvo é medido num processo Python novo, com -X importtime, e o relatório
+mostra o tempo total e os pacotes mais pesados (tempo acumulado, incluindo as
+dependências de cada um; um pacote importado por outro aparece nos dois). Os
+módulos carregados pela inicialização do interpretador são descontados.
+
+Os apps (scripts que importam streamlit) são medidos pelos imports do topo do
+script, sem executar a interface: é o custo fixo de cada cold start. Os
+demais módulos são medidos por "import modulo", como os importam os workers
+e as linhas de comando.
+
+    python medir_importacao.py                       # todos os apps e módulos
+    python medir_importacao.py hiscre.py pdf_extract.py --top 5 --repeticoes 3
+"""
+
+import argparse
+import ast
+import glob
+import os
+import subprocess
+import sys
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+TOP_PADRAO = 8
+REPETICOES_PADRAO = 3
+
+
+def imports_do_topo(caminho):
+    """Instruções import/from do nível superior do arquivo, como código-fonte."""
+    with open(caminho, encoding="utf-8") as f:
+        arvore = ast.parse(f.read(), filename=caminho)
+    return [ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))]
+
+
+def eh_app(imports):
+    return any(i.split()[1].split(".")[0] == "streamlit" for i in imports)
+
+
+def codigo_do_alvo(caminho):
+    """(tipo, código a medir): imports do topo para apps, "import modulo" para módulos."""
+    imports = imports_do_topo(caminho)
+    if eh_app(imports):
+        return "app", "\n".join(imports)
+    return "módulo", f"import {os.path.splitext(os.path.basename(caminho))[0]}"
+
+
+def ler_importtime(saida):
+    """
+    Linhas do -X importtime (stderr) -> [(nível, próprio_us, acumulado_us, módulo)].
+    O nível vem do recuo do nome do módulo (2 espaços por nível).
+    """
+    registros = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "[us]" in linha:
+            continue
+        proprio, acumulado, nome = linha.split(":", 1)[1].split("|")
+        recuo = len(nome) - len(nome.lstrip(" ")) - 1
+        registros.append((recuo // 2, int(proprio), int(acumulado), nome.strip()))
+    return registros
+
+
+def medir(codigo, ignorar=frozenset()):
+    """
+    Mede uma execução de `codigo` num processo novo. Retorna (total_us,
+    {pacote: acumulado_us}), sem os módulos em `ignorar` (os da inicialização
+    do interpretador). Cada pacote é contado onde foi importado pela primeira
+    vez, com tudo o que ele importou.
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=DIRETORIO, capture_output=True, text=True
+    )
+    if resultado.returncode != 0:
+        erro = (resultado.stderr.strip().splitlines() or ["erro desconhecido"])[-1]
+        raise RuntimeError(erro)
+    registros = ler_importtime(resultado.stderr)
+    total = sum(acumulado for nivel, _, acumulado, nome in registros if nivel == 0 and nome not in ignorar)
+    pacotes = {}
+    for _, _, acumulado, nome in registros:
+        raiz = nome.split(".")[0]
+        if raiz not in ignorar:
+            pacotes[raiz] = max(pacotes.get(raiz, 0), acumulado)
+    return total, pacotes
+
+
+def modulos_da_inicializacao():
+    """Módulos importados pelo próprio interpretador ao iniciar (descontados das medições)."""
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True)
+    return frozenset(nome.split(".")[0] for _, _, _, nome in ler_importtime(resultado.stderr))
+
+
+def medir_alvo(caminho, repeticoes=REPETICOES_PADRAO, ignorar=frozenset()):
+    """
+    Mede o alvo `repeticoes` vezes e fica com a execução mais rápida (a
+    primeira costuma pagar a leitura do disco). Retorna (tipo, total_ms,
+    [(ms, pacote)] do mais pesado ao mais leve).
+    """
+    tipo, codigo = codigo_do_alvo(caminho)
+    total, pacotes = min((medir(codigo, ignorar) for _ in range(repeticoes)), key=lambda m: m[0])
+    return tipo, total / 1000, sorted(((us / 1000, p) for p, us in pacotes.items()), reverse=True)
+
+
+def alvos_padrao():
+    """Todos os .py da raiz do repositório, exceto este script."""
+    return sorted(
+        c for c in glob.glob(os.path.join(DIRETORIO, "*.py"))
+        if os.path.basename(c) != os.path.basename(__file__)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tempo de importação dos apps e módulos (python -X importtime)")
+    parser.add_argument("alvos", nargs="*", help="Arquivos .py (padrão: todos os da raiz do repositório)")
+    parser.add_argument("--top", type=int, default=TOP_PADRAO, help="Imports mais pesados listados por alvo")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO, help="Medições por alvo (fica a menor)")
+    args = parser.parse_args()
+
+    inicializacao = modulos_da_inicializacao()
+    resumo = []
+    for caminho in [os.path.abspath(a) for a in args.alvos] or alvos_padrao():
+        nome = os.path.basename(caminho)
+        try:
+            tipo, total_ms, modulos = medir_alvo(caminho, args.repeticoes, inicializacao)
+        except RuntimeError as e:
+            print(f"\n{nome}: falha ao importar ({e})")
+            continue
+        resumo.append((total_ms, nome, tipo))
+        print(f"\n{nome} ({tipo}): {total_ms:.0f} ms")
+        for ms, modulo in modulos[:args.top]:
+            print(f"  {ms:9.1f} ms  {modulo}")
+
+    print("\nResumo (do mais lento ao mais rápido):")
+    for total_ms, nome, tipo in sorted(resumo, reverse=True):
+        print(f"  {total_ms:9.0f} ms  {nome} ({tipo})")
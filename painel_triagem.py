@@ -0,0 +1,90 @@
+import datetime
+
+import streamlit as st
+
+from triagem_replica import ReplicaTriagem
+from triagem_sheets import conexao_de_secrets
+
+# Réplica local da planilha Triagem_Clientes (SQLite)
+CAMINHO_REPLICA = "triagem_replica.sqlite3"
+# Intervalo mínimo entre sincronizações automáticas (segundos)
+INTERVALO_SINCRONIZACAO = 60
+
+st.set_page_config(page_title="Painel da Triagem", page_icon="📊", layout="wide")
+
+
+# ================================
+# CONEXÃO E RÉPLICA
+# ================================
+@st.cache_resource
+def conectar_google_sheets():
+    """Conexão com Google Sheets compartilhada por todas as sessões."""
+    return conexao_de_secrets(st.secrets)
+
+
+@st.cache_resource
+def obter_replica():
+    """Réplica local compartilhada pelo processo."""
+    return ReplicaTriagem(st.secrets.get("replica_triagem_db", CAMINHO_REPLICA))
+
+
+# ================================
+# INTERFACE STREAMLIT
+# ================================
+st.title("📊 Painel da Triagem Jurídica")
+st.write("Acompanhamento dos atendimentos registrados na planilha Triagem_Clientes.")
+
+replica = obter_replica()
+
+col_sync1, col_sync2 = st.columns(2)
+with col_sync1:
+    atualizar = st.button("🔄 Sincronizar agora")
+with col_sync2:
+    ressincronizar = st.button("♻️ Recopiar planilha inteira")
+
+try:
+    if ressincronizar:
+        novas = replica.ressincronizar(conectar_google_sheets())
+    else:
+        # sincronização incremental (no máximo uma por intervalo, salvo pedido explícito)
+        novas = replica.sincronizar(
+            conectar_google_sheets(),
+            intervalo_minimo=0 if atualizar else INTERVALO_SINCRONIZACAO
+        )
+    if novas:
+        st.success(f"✅ {novas} novo(s) registro(s) copiados da planilha.")
+except Exception as e:
+    st.warning(f"Não foi possível sincronizar com a planilha (exibindo a cópia local): {e}")
+
+ultima = replica.ultima_sincronizacao()
+if ultima:
+    momento = datetime.datetime.fromtimestamp(ultima).strftime("%d/%m/%Y %H:%M:%S")
+    st.caption(f"Última sincronização: {momento}")
+
+st.metric("Total de atendimentos", replica.total())
+
+# ================================
+# CONTAGENS
+# ================================
+col1, col2, col3 = st.columns(3)
+
+for coluna, titulo, agrupamento in [
+    (col1, "Por classificação", "classificacao"),
+    (col2, "Por urgência", "urgencia"),
+    (col3, "Por contato preferencial", "contato_preferencial"),
+]:
+    with coluna:
+        st.subheader(titulo)
+        contagem = replica.contagem_por(agrupamento)
+        if contagem.empty:
+            st.info("Sem registros.")
+        else:
+            st.bar_chart(contagem.set_index(agrupamento)["quantidade"])
+            st.dataframe(contagem, use_container_width=True)
+
+# ================================
+# REGISTROS RECENTES
+# ================================
+st.markdown("---")
+st.subheader("🕒 Atendimentos mais recentes")
+st.dataframe(replica.ultimos(50), use_container_width=True)
@@ -1,168 +1,131 @@
 import streamlit as st
 import pandas as pd
-import pdfplumber
-import io
+import hashlib
+import math
 from io import BytesIO
 import re
-from datetime import datetime
+import time
 
-def detect_date_column(column_data):
-    """Detecta se uma coluna contém datas no formato MM/AAAA"""
-    date_pattern = r'^\d{1,2}/\d{4}$'
-    date_count = 0
-    total_non_empty = 0
-    
-    for value in column_data:
-        if pd.notna(value) and str(value).strip():
-            total_non_empty += 1
-            if re.match(date_pattern, str(value).strip()):
-                date_count += 1
-    
-    # Se mais de 80% dos valores não vazios são datas, considera como coluna de data
-    if total_non_empty > 0 and (date_count / total_non_empty) > 0.8:
-        return True
-    return False
+# TableRecord era definido neste módulo e continua importável daqui; os resultados
+# gravados (pickle) referenciam tabelas_pdf.TableRecord
+from tabelas_pdf import TableRecord, combine_all_tables, infer_numeric_types  # noqa: F401
+from tarefas import CONCLUIDA, ERRO, FilaTarefas, id_tarefa
 
-def detect_header_row(table_data):
-    """Detecta automaticamente a linha do cabeçalho"""
-    if not table_data or len(table_data) < 2:
-        return 0
-    
-    # Verificar se a primeira linha parece ser cabeçalho
-    first_row = table_data[0]
-    second_row = table_data[1]
-    
-    # Critérios para identificar cabeçalho:
-    # 1. Se a primeira linha contém principalmente texto e a segunda contém datas/números
-    # 2. Se a primeira linha tem muitos valores vazios/nulos (provavelmente não é cabeçalho)
-    # 3. Se a segunda linha começa com uma data
-    
-    first_row_non_empty = sum(1 for cell in first_row if cell and str(cell).strip())
-    second_row_non_empty = sum(1 for cell in second_row if cell and str(cell).strip())
-    
-    # Se a primeira linha tem poucos valores não vazios, provavelmente não é cabeçalho
-    if first_row_non_empty < len(first_row) * 0.3:
-        return 0  # Não tem cabeçalho
-    
-    # Verificar se a segunda linha começa com data
-    if second_row and second_row[0] and detect_date_column([second_row[0]]):
-        return 0  # Não tem cabeçalho, dados começam na primeira linha
-    
-    # Verificar se a primeira linha parece ter nomes de colunas (texto mais descritivo)
-    first_row_has_text = sum(1 for cell in first_row if cell and any(c.isalpha() for c in str(cell)))
-    second_row_has_numbers = sum(1 for cell in second_row if cell and any(c.isdigit() for c in str(cell)))
-    
-    if first_row_has_text > second_row_has_numbers:
-        return 0  # Primeira linha é provavelmente cabeçalho
-    else:
-        return -1  # Não tem cabeçalho claro
+# Linhas enviadas ao navegador por página de visualização
+PREVIEW_ROWS = 50
+# Intervalo (segundos) entre consultas ao progresso da tarefa de extração
+POLL_INTERVAL = 0.5
+# Marca, no session_state, a execução agendada para acompanhar a tarefa
+POLLING_KEY = "acompanhando_extracao"
+# Tarefa de extração das tabelas, executada pelo worker de tarefas.py
+EXTRACTION_JOB = "tarefas_extracao:extrair_tabelas_pdf"
 
-def clean_column_names(columns):
-    """Limpa e corrige nomes de colunas duplicados"""
-    seen = {}
-    cleaned_columns = []
-    
-    for i, col in enumerate(columns):
-        if col is None or col == '':
-            col = f'Coluna_{i+1}'
-        elif col in seen:
-            seen[col] += 1
-            col = f'{col}_{seen[col]}'
-        else:
-            seen[col] = 1
-        cleaned_columns.append(col)
-    
-    return cleaned_columns
+@st.cache_data(max_entries=256)
+def table_summary(file_key, table_key, columns, _df):
+    """Linhas, colunas e preenchimento de uma tabela (calculados uma vez por seleção)"""
+    data = _df[list(columns)]
+    total_cells = data.shape[0] * data.shape[1]
+    filled_cells = int(data.count().sum())
+    return {
+        'rows': data.shape[0],
+        'cols': data.shape[1],
+        'fill_rate': filled_cells / total_cells * 100 if total_cells else 0.0,
+    }
 
-def generate_column_names(num_columns, first_row_data=None):
-    """Gera nomes de colunas baseados no conteúdo ou sequenciais"""
-    columns = []
-    
-    if first_row_data and any(first_row_data):
-        # Tentar usar a primeira linha como base para nomes
-        for i, cell in enumerate(first_row_data):
-            if cell and str(cell).strip():
-                # Verificar se é data - se for, usar nome padrão
-                if detect_date_column([cell]):
-                    columns.append(f'Data')
-                else:
-                    columns.append(f'Coluna_{i+1}_{str(cell)[:20]}')
-            else:
-                columns.append(f'Coluna_{i+1}')
-    else:
-        # Nomes sequenciais
-        columns = [f'Coluna_{i+1}' for i in range(num_columns)]
-    
-    return clean_column_names(columns)
+def preview_table(df, key, height=250, page_size=PREVIEW_ROWS):
+    """Mostra apenas uma janela de linhas da tabela, com seletor de página"""
+    total = len(df)
+    n_pages = max(1, math.ceil(total / page_size))
+    page = 1
+    if n_pages > 1:
+        page = st.number_input(
+            f"Página da visualização (1 a {n_pages})",
+            min_value=1, max_value=n_pages, value=1, step=1,
+            key=f"preview_{key}"
+        )
+    start = (page - 1) * page_size
+    window = infer_numeric_types(df.iloc[start:start + page_size])
+    st.dataframe(window, use_container_width=True, height=height)
+    if total:
+        st.caption(f"Linhas {start + 1}–{min(start + page_size, total)} de {total}")
 
-def extract_tables_from_pdf(pdf_file):
-    """Extrai todas as tabelas de um arquivo PDF com detecção inteligente de cabeçalhos"""
-    tables = []
-    with pdfplumber.open(pdf_file) as pdf:
-        for page_num, page in enumerate(pdf.pages):
-            try:
-                # Extrair tabelas da página
-                page_tables = page.extract_tables()
-                
-                for table_num, table in enumerate(page_tables):
-                    if table and len(table) > 1:  # Ignorar tabelas vazias ou com apenas uma linha
-                        try:
-                            # Detectar se tem cabeçalho
-                            header_row_index = detect_header_row(table)
-                            
-                            if header_row_index == 0:
-                                # Tem cabeçalho na primeira linha
-                                headers = table[0]
-                                data_rows = table[1:]
-                            else:
-                                # Não tem cabeçalho claro - gerar nomes automaticamente
-                                headers = generate_column_names(len(table[0]), table[0])
-                                data_rows = table
-                            
-                            # Limpar nomes de colunas
-                            cleaned_headers = clean_column_names(headers)
-                            
-                            # Converter para DataFrame
-                            df = pd.DataFrame(data_rows, columns=cleaned_headers)
-                            
-                            # Adicionar metadados
-                            df['_page'] = page_num + 1
-                            df['_table'] = table_num + 1
-                            df['_table_id'] = f"p{page_num+1}_t{table_num+1}"
-                            df['_has_header'] = (header_row_index == 0)
-                            
-                            # Remover linhas completamente vazias
-                            df = df.dropna(how='all')
-                            
-                            # Remover colunas completamente vazias
-                            df = df.dropna(axis=1, how='all')
-                            
-                            if not df.empty and len(df.columns) > 3:  # Pelo menos uma coluna de dados além dos metadados
-                                tables.append(df)
-                                
-                        except Exception as e:
-                            st.warning(f"⚠️ Erro na tabela {table_num+1} da página {page_num+1}: {str(e)}")
-                            continue
-                            
-            except Exception as e:
-                st.warning(f"⚠️ Erro na página {page_num+1}: {str(e)}")
-                continue
-                
-    return tables
+def _export_tables(data):
+    return {
+        name: (record, infer_numeric_types(record.data[list(columns)]))
+        for name, (record, columns) in data.items()
+    }
 
-def combine_all_tables(extracted_data):
-    """Combina todas as tabelas em um único DataFrame"""
-    combined_dfs = []
-    
-    for table_name, df in extracted_data.items():
-        # Adicionar coluna identificadora
-        df_copy = df.copy()
-        df_copy['Fonte_Tabela'] = table_name
-        combined_dfs.append(df_copy)
-    
-    if combined_dfs:
-        return pd.concat(combined_dfs, ignore_index=True)
-    return pd.DataFrame()
+@st.cache_data(max_entries=16)
+def build_excel_multiple(file_key, selection, _data):
+    """Excel com uma aba por tabela (gerado só quando a seleção muda)"""
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        for table_name, (_, table_data) in _export_tables(_data).items():
+            # Limitar nome da aba para 31 caracteres (limitação do Excel)
+            sheet_name = re.sub(r'[\\/*?:\[\]]', '', table_name)[:31]
+            table_data.to_excel(writer, index=False, sheet_name=sheet_name)
+    return buffer.getvalue()
+
+@st.cache_data(max_entries=16)
+def build_excel_combined(file_key, selection, _data):
+    """Excel com todas as tabelas juntas; devolve (bytes, prévia das primeiras linhas, total de linhas)"""
+    combined_df = combine_all_tables(_export_tables(_data))
+    if combined_df.empty:
+        return None, combined_df, 0
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        combined_df.to_excel(writer, index=False, sheet_name='Todas_Tabelas')
+    return buffer.getvalue(), combined_df.head(PREVIEW_ROWS), len(combined_df)
+
+@st.cache_data(max_entries=16)
+def build_csv_files(file_key, selection, _data):
+    """CSV de cada tabela selecionada"""
+    return {
+        table_name: table_data.to_csv(index=False, sep=';', decimal=',')
+        for table_name, (_, table_data) in _export_tables(_data).items()
+    }
+
+@st.cache_resource
+def get_job_queue():
+    """Fila de tarefas compartilhada pelas sessões (remove resultados antigos ao iniciar)."""
+    queue = FilaTarefas()
+    queue.limpar_antigas()
+    return queue
+
+@st.cache_resource(max_entries=8)
+def load_job_result(job_id):
+    """Resultado de uma tarefa concluída, lido do disco uma vez por processo."""
+    return get_job_queue().resultado(job_id)
+
+def run_extraction_job(content, deduplicate):
+    """
+    Extrai as tabelas numa tarefa em segundo plano (tarefas.py). A tarefa
+    continua se a página recarregar, e o mesmo arquivo com as mesmas opções
+    reaproveita o resultado. Retorna (tabelas, erros), ou None enquanto a
+    tarefa não termina: o progresso é mostrado uma vez e quem chama agenda a
+    próxima consulta (wait_and_rerun), sem prender a sessão num laço.
+    """
+    queue = get_job_queue()
+    params = {"caminho": queue.salvar_entrada(content, ".pdf"), "deduplicate": deduplicate}
+    job_id = id_tarefa(EXTRACTION_JOB, params)
+    job = queue.status(job_id) if st.session_state.pop(POLLING_KEY, False) else None
+    if job is None or job["status"] != ERRO:
+        # durante o acompanhamento, uma tarefa com erro não volta para a fila a cada consulta
+        queue.submeter(EXTRACTION_JOB, **params)
+        job = queue.status(job_id)
+    if job["status"] == ERRO:
+        raise RuntimeError(job["erro"])
+    if job["status"] != CONCLUIDA:
+        st.progress(job["progresso"])
+        st.text(f"🔍 Extraindo tabelas do PDF... {job['mensagem']}")
+        return None
+    return load_job_result(job_id)
+
+def wait_and_rerun():
+    """Nova execução do script depois de POLL_INTERVAL (próxima consulta à tarefa)."""
+    time.sleep(POLL_INTERVAL)
+    st.session_state[POLLING_KEY] = True
+    st.rerun()
 
 def main():
     st.set_page_config(page_title="Extrator Multi-Tabelas PDF", page_icon="📄", layout="wide")
@@ -170,6 +133,35 @@ def main():
     st.title("📄 Extrator Multi-Tabelas de PDF")
     st.write("Extraia múltiplas tabelas de PDFs com detecção automática de cabeçalhos")
     
+    # Instruções na sidebar (antes da extração, que pode interromper o script com st.rerun)
+    with st.sidebar:
+        st.header("ℹ️ Instruções")
+        st.markdown("""
+        1. **Upload** do PDF com tabelas
+        2. **Selecione múltiplas tabelas** na lista
+        3. **Para cada tabela:** escolha as colunas
+        4. **Visualize** os dados selecionados
+        5. **Baixe** no formato desejado
+        
+        **Recursos de detecção:**
+        - ✅ Cabeçalhos automáticos
+        - ✅ Detecção de colunas de data
+        - ✅ Nomes inteligentes para colunas
+        - ✅ Tratamento de tabelas sem cabeçalho
+        """)
+        
+        st.header("🔍 Sobre a Detecção")
+        st.markdown("""
+        **Cabeçalhos detectados automaticamente quando:**
+        - Primeira linha contém texto descritivo
+        - Segunda linha contém dados (números/datas)
+        
+        **Cabeçalhos gerados automaticamente quando:**
+        - Tabela começa direto com dados
+        - Primeira linha contém datas/números
+        - Estrutura não parece ter cabeçalho
+        """)
+    
     # Upload do arquivo PDF
     uploaded_file = st.file_uploader(
         "Escolha um arquivo PDF", 
@@ -177,19 +169,33 @@ def main():
         help="Formatos suportados: PDF"
     )
     
+    deduplicate = st.checkbox(
+        "Agrupar tabelas repetidas",
+        value=True,
+        help="Tabelas idênticas em várias páginas (legendas, resumos) aparecem uma só vez, com a lista de páginas"
+    )
+    
     if uploaded_file is not None:
         try:
-            with st.spinner("🔍 Extraindo tabelas do PDF..."):
-                tables = extract_tables_from_pdf(uploaded_file)
+            file_key = hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+            result = run_extraction_job(uploaded_file.getvalue(), deduplicate)
+            if result is None:
+                wait_and_rerun()
+            tables, errors = result
+            for message in errors:
+                st.warning(message)
             
             if not tables:
                 st.error("❌ Nenhuma tabela encontrada no PDF")
                 return
             
             st.success(f"✅ {len(tables)} tabela(s) encontrada(s) no PDF")
+            repeated = sum(len(table.pages) - 1 for table in tables)
+            if repeated:
+                st.info(f"🔁 {repeated} repetição(ões) de tabelas idênticas agrupada(s)")
             
             # Mostrar estatísticas de cabeçalhos detectados
-            headers_detected = sum(1 for table in tables if table['_has_header'].iloc[0])
+            headers_detected = sum(1 for table in tables if table.has_header)
             st.info(f"📊 {headers_detected} tabela(s) com cabeçalho detectado | {len(tables) - headers_detected} tabela(s) com cabeçalho gerado automaticamente")
             
             # Seleção múltipla de tabelas
@@ -198,18 +204,21 @@ def main():
             # Criar opções para seleção
             table_options = []
             for i, table in enumerate(tables):
-                page = table['_page'].iloc[0]
-                table_num = table['_table'].iloc[0]
-                has_header = table['_has_header'].iloc[0]
-                cols = len(table.columns) - 4  # Descontar colunas de metadados
-                rows = len(table)
+                page = table.page
+                table_num = table.table
+                has_header = table.has_header
+                rows, cols = table.data.shape
                 
                 header_status = "✅ Com cabeçalho" if has_header else "🤖 Cabeçalho gerado"
+                if len(table.pages) > 1:
+                    location = f"Páginas {table.pages_label} - repetida {len(table.pages)}×"
+                else:
+                    location = f"Página {page}"
                 
                 table_options.append({
                     'index': i,
-                    'label': f"Tabela {table_num} (Página {page}) - {rows}×{cols} - {header_status}",
-                    'page': page,
+                    'label': f"Tabela {table_num} ({location}) - {rows}×{cols} - {header_status}",
+                    'page': table.pages_label,
                     'table_num': table_num,
                     'rows': rows,
                     'cols': cols,
@@ -230,9 +239,10 @@ def main():
             
             # Container para cada tabela selecionada
             all_extracted_data = {}
+            all_summaries = {}
             
             for table_idx in selected_table_indices:
-                df = tables[table_idx]
+                record = tables[table_idx]
                 table_info = table_options[table_idx]
                 
                 st.markdown("---")
@@ -241,64 +251,52 @@ def main():
                 header_icon = "✅" if table_info['has_header'] else "🤖"
                 st.subheader(f"{header_icon} {table_info['label']}")
                 
-                # Remover colunas internas de controle para display
-                df_display = df.drop(['_page', '_table', '_table_id', '_has_header'], axis=1, errors='ignore')
+                df_display = record.data
                 
-                # Mostrar preview da tabela
+                # Mostrar preview da tabela (apenas uma janela de linhas)
+                all_columns = tuple(df_display.columns)
+                summary = table_summary(file_key, record.table_id, all_columns, df_display)
                 col1, col2, col3 = st.columns([3, 1, 1])
                 
                 with col1:
-                    st.dataframe(df_display, use_container_width=True, height=250)
+                    preview_table(df_display, f"table_{table_idx}", height=250)
                 
                 with col2:
-                    st.metric("Linhas", df_display.shape[0])
-                    st.metric("Colunas", df_display.shape[1])
+                    st.metric("Linhas", summary['rows'])
+                    st.metric("Colunas", summary['cols'])
                 
                 with col3:
                     st.metric("Página", table_info['page'])
                     st.metric("Cabeçalho", "Detectado" if table_info['has_header'] else "Gerado")
                 
-                # Preparar dados para seleção
-                df_clean = df_display.copy()
-                
-                # Tentar inferir tipos de dados
-                for col in df_clean.columns:
-                    try:
-                        # Tentar converter para numérico
-                        df_clean[col] = pd.to_numeric(df_clean[col], errors='ignore')
-                    except:
-                        pass
-                
                 # Seleção de colunas para esta tabela
-                if len(df_clean.columns) > 0:
+                if len(all_columns) > 0:
                     selected_columns = st.multiselect(
-                        f"Selecione colunas para extrair:",
-                        options=df_clean.columns.tolist(),
-                        default=df_clean.columns.tolist()[:min(3, len(df_clean.columns))],
+                        "Selecione colunas para extrair:",
+                        options=list(all_columns),
+                        default=list(all_columns)[:min(3, len(all_columns))],
                         key=f"cols_{table_idx}"
                     )
                     
                     if selected_columns:
-                        # Criar dataframe com colunas selecionadas
-                        extracted_df = df_clean[selected_columns]
-                        
                         # Mostrar preview
                         st.write("**Visualização dos dados selecionados:**")
-                        st.dataframe(extracted_df, use_container_width=True, height=200)
+                        preview_table(df_display[selected_columns], f"selected_{table_idx}", height=200)
                         
-                        # Armazenar para download conjunto
-                        all_extracted_data[table_info['label']] = extracted_df
+                        # Armazenar para download conjunto (a tabela completa só é
+                        # lida ao gerar os arquivos de download)
+                        all_extracted_data[table_info['label']] = (record, tuple(selected_columns))
+                        selected_summary = table_summary(file_key, record.table_id, tuple(selected_columns), df_display)
+                        all_summaries[table_info['label']] = selected_summary
                         
                         # Estatísticas desta tabela
                         col3, col4, col5 = st.columns(3)
                         with col3:
-                            st.metric(f"Linhas extraídas", extracted_df.shape[0])
+                            st.metric("Linhas extraídas", selected_summary['rows'])
                         with col4:
-                            st.metric(f"Colunas extraídas", extracted_df.shape[1])
+                            st.metric("Colunas extraídas", selected_summary['cols'])
                         with col5:
-                            total_cells = extracted_df.shape[0] * extracted_df.shape[1]
-                            filled_cells = extracted_df.count().sum()
-                            st.metric(f"Preenchimento", f"{(filled_cells/total_cells*100):.1f}%")
+                            st.metric("Preenchimento", f"{selected_summary['fill_rate']:.1f}%")
             
             # Download de todas as tabelas selecionadas
             if all_extracted_data:
@@ -312,18 +310,12 @@ def main():
                 )
                 
                 timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M')
+                selection = tuple((name, columns) for name, (_, columns) in all_extracted_data.items())
                 
                 if download_format == "Excel (Múltiplas abas)":
-                    buffer = BytesIO()
-                    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                        for table_name, table_data in all_extracted_data.items():
-                            # Limitar nome da aba para 31 caracteres (limitação do Excel)
-                            sheet_name = re.sub(r'[\\/*?:\[\]]', '', table_name)[:31]
-                            table_data.to_excel(writer, index=False, sheet_name=sheet_name)
-                    
                     st.download_button(
                         label="📥 Baixar Excel com Múltiplas Abas",
-                        data=buffer.getvalue(),
+                        data=build_excel_multiple(file_key, selection, all_extracted_data),
                         file_name=f"multiplas_tabelas_abas_{timestamp}.xlsx",
                         mime="application/vnd.ms-excel",
                         key="excel_multiple"
@@ -331,16 +323,12 @@ def main():
                 
                 elif download_format == "Excel (Todas juntas)":
                     # Combinar todas as tabelas
-                    combined_df = combine_all_tables(all_extracted_data)
+                    excel_data, combined_head, combined_rows = build_excel_combined(file_key, selection, all_extracted_data)
                     
-                    if not combined_df.empty:
-                        buffer = BytesIO()
-                        with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                            combined_df.to_excel(writer, index=False, sheet_name='Todas_Tabelas')
-                        
+                    if excel_data is not None:
                         st.download_button(
                             label="📥 Baixar Excel com Todas as Tabelas Juntas",
-                            data=buffer.getvalue(),
+                            data=excel_data,
                             file_name=f"todas_tabelas_juntas_{timestamp}.xlsx",
                             mime="application/vnd.ms-excel",
                             key="excel_combined"
@@ -348,12 +336,12 @@ def main():
                         
                         # Mostrar preview da tabela combinada
                         st.write("**Preview da tabela combinada:**")
-                        st.dataframe(combined_df, use_container_width=True, height=300)
+                        st.dataframe(combined_head, use_container_width=True, height=300)
+                        st.caption(f"Primeiras {len(combined_head)} de {combined_rows} linhas")
                 
                 else:  # CSV Individual
                     st.write("**Download individual de cada tabela:**")
-                    for table_name, table_data in all_extracted_data.items():
-                        csv_data = table_data.to_csv(index=False, sep=';', decimal=',')
+                    for table_name, csv_data in build_csv_files(file_key, selection, all_extracted_data).items():
                         safe_name = re.sub(r'[\\/*?:"<>|]', "", table_name)
                         
                         st.download_button(
@@ -369,8 +357,8 @@ def main():
                 st.subheader("📈 Resumo da Extração")
                 
                 total_tables = len(all_extracted_data)
-                total_rows = sum([df.shape[0] for df in all_extracted_data.values()])
-                total_cols = sum([df.shape[1] for df in all_extracted_data.values()])
+                total_rows = sum(summary['rows'] for summary in all_summaries.values())
+                total_cols = sum(summary['cols'] for summary in all_summaries.values())
                 
                 col6, col7, col8 = st.columns(3)
                 with col6:
@@ -382,35 +370,6 @@ def main():
                 
         except Exception as e:
             st.error(f"❌ Erro ao processar o PDF: {str(e)}")
-    
-    # Instruções na sidebar
-    with st.sidebar:
-        st.header("ℹ️ Instruções")
-        st.markdown("""
-        1. **Upload** do PDF com tabelas
-        2. **Selecione múltiplas tabelas** na lista
-        3. **Para cada tabela:** escolha as colunas
-        4. **Visualize** os dados selecionados
-        5. **Baixe** no formato desejado
-        
-        **Recursos de detecção:**
-        - ✅ Cabeçalhos automáticos
-        - ✅ Detecção de colunas de data
-        - ✅ Nomes inteligentes para colunas
-        - ✅ Tratamento de tabelas sem cabeçalho
-        """)
-        
-        st.header("🔍 Sobre a Detecção")
-        st.markdown("""
-        **Cabeçalhos detectados automaticamente quando:**
-        - Primeira linha contém texto descritivo
-        - Segunda linha contém dados (números/datas)
-        
-        **Cabeçalhos gerados automaticamente quando:**
-        - Tabela começa direto com dados
-        - Primeira linha contém datas/números
-        - Estrutura não parece ter cabeçalho
-        """)
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,30 @@
 import io
-import re
-import unicodedata
-from collections import defaultdict
+import os
 import time
 
-import pdfplumber
 import pandas as pd
 import streamlit as st
 from difflib import get_close_matches
 
+from checkpoint_extracao import CheckpointExtracao
+from medalhistas import (PAGES_PER_CHECKPOINT, RAW_DATE_COLUMN, extraction_key, memory_usage_mb, normalize_name,
+                         rows_to_frame)
+from tarefas import CONCLUIDA, ERRO, FilaTarefas, id_tarefa
+
+# Checkpoints da extração (SQLite local), gravados a cada bloco de páginas
+CHECKPOINT_DB = "medalhistas_checkpoint.sqlite3"
+# Modos de extração; o modo entra na chave do checkpoint (um modo não reaproveita as linhas do outro)
+EXTRACTION_MODES = {
+    "Colunas (posição das palavras)": "colunas",
+    "Texto (heurística)": "texto",
+}
+# Tarefa de extração de um PDF, executada pelo worker de tarefas.py (vários PDFs em paralelo)
+EXTRACTION_JOB = "tarefas_extracao:extrair_medalhistas"
+# Intervalo (segundos) entre atualizações do progresso durante a extração
+PROGRESS_INTERVAL = 0.5
+# Marca, no session_state, a execução agendada para acompanhar as tarefas
+POLLING_KEY = "acompanhando_extracao"
+
 st.set_page_config(page_title="Extrator de Lista por Estado", layout="wide")
 
 st.title("📄 Extrator de Lista de Medalhistas por Estado")
@@ -16,110 +32,197 @@ st.title("📄 Extrator de Lista de Medalhistas por Estado")
 st.markdown(
     """
 ### 🧩 Passos:
-1. Envie o PDF (texto copiável).  
+1. Envie um ou mais PDFs (texto copiável) — por exemplo, um por nível ou por região.  
 2. O app extrai automaticamente colunas como **Aluno**, **Data nascimento**, **Estado**, **Nível** e **Medalha**.  
 3. Gere um Excel com duas abas e compare com uma lista de nomes colada abaixo.
 """
 )
 
-uploaded_file = st.file_uploader("Envie o PDF (texto copiável)", type=["pdf"])
-
-# Funções utilitárias
-def strip_accents(text: str) -> str:
-    if not isinstance(text, str):
-        return text
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
-    return text
-
-def parse_table_rows_from_text(text: str):
-    """Heurística simples: extrai linhas contendo datas (formato dd/mm/aaaa)."""
-    rows = []
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    date_re = re.compile(r'\d{1,2}/\d{1,2}/\d{4}')
-    for ln in lines:
-        # ignorar cabeçalhos
-        if re.search(r'MEDALHISTAS|ALUNO|Data nascimento|Nível|Medalha', ln, re.IGNORECASE):
-            continue
-        m = date_re.search(ln)
-        if m:
-            name = ln[:m.start()].strip()
-            date = m.group().strip()
-            rest = ln[m.end():].strip()
-            parts = rest.split()
-            estado = parts[0] if len(parts) >= 1 else ""
-            nivel = parts[1] if len(parts) >= 2 else ""
-            medalha = parts[2] if len(parts) >= 3 else ""
-            rows.append({
-                "Aluno": name,
-                "Data nascimento": date,
-                "Estado": estado,
-                "Nível": nivel,
-                "Medalha": medalha
-            })
-    return rows
-
-def extract_from_pdf(file_stream):
-    """Extrai dados de PDF de forma otimizada (para arquivos longos)."""
-    df_rows = []
-    with pdfplumber.open(file_stream) as pdf:
-        total_pages = len(pdf.pages)
-        progress = st.progress(0)
-        status = st.empty()
-
-        for i, page in enumerate(pdf.pages):
-            status.text(f"🔍 Lendo página {i+1}/{total_pages}...")
-            try:
-                text = page.extract_text() or ""
-                rows = parse_table_rows_from_text(text)
-                df_rows.extend(rows)
-            except Exception as e:
-                st.warning(f"Erro na página {i+1}: {e}")
-            progress.progress((i + 1) / total_pages)
-            time.sleep(0.02)  # pequena pausa para visualização do progresso
-
-        status.text("✅ Extração finalizada.")
-        progress.empty()
-
-    df = pd.DataFrame(df_rows)
-    if not df.empty:
-        df = df.astype(str)
-        for col in df.columns:
-            df[col] = df[col].str.strip()
-        df = df[df["Aluno"].str.strip() != ""].reset_index(drop=True)
-    else:
-        df = pd.DataFrame(columns=["Aluno", "Data nascimento", "Estado", "Nível", "Medalha"])
-    return df
+uploaded_files = st.file_uploader("Envie os PDFs (texto copiável)", type=["pdf"], accept_multiple_files=True)
+extraction_mode = EXTRACTION_MODES[st.radio(
+    "Modo de extração:",
+    list(EXTRACTION_MODES),
+    horizontal=True,
+    help="Colunas: usa a posição das palavras na página (nomes, níveis e medalhas com várias palavras). "
+         "Texto: separa por espaços (modo antigo)."
+)]
+
+@st.cache_resource
+def get_checkpoint():
+    """Checkpoints compartilhados pelo processo (remove extrações antigas ao iniciar)."""
+    checkpoint = CheckpointExtracao(CHECKPOINT_DB)
+    checkpoint.limpar_antigos()
+    return checkpoint
+
+@st.cache_resource
+def get_job_queue():
+    """Fila de tarefas de extração compartilhada pelas sessões."""
+    queue = FilaTarefas()
+    queue.limpar_antigas()
+    return queue
+
+def _show_progress(progress, status, checkpoint, keys):
+    done = total = 0
+    for key in keys.values():
+        pages_done, pages_total = checkpoint.progresso(key)
+        done += pages_done
+        total += pages_total
+    if total:
+        progress.progress(min(done / total, 1.0))
+        status.text(f"🔍 Lendo páginas... {done}/{total} ({len(keys)} arquivo(s))")
+
+def unique_names(files):
+    """
+    Nome de cada arquivo enviado. Nomes repetidos (mesmo nome em pastas
+    diferentes) ganham sufixo " (2)", " (3)"..., para não juntar os arquivos.
+    """
+    counts, names = {}, []
+    for f in files:
+        counts[f.name] = counts.get(f.name, 0) + 1
+        names.append(f.name if counts[f.name] == 1 else f"{f.name} ({counts[f.name]})")
+    return names
+
+def job_params(content, mode):
+    """Parâmetros da tarefa de extração de um PDF (mesmo arquivo e modo, mesma tarefa)."""
+    path = get_job_queue().salvar_entrada(content, ".pdf")
+    return {"caminho": path, "modo": mode, "checkpoint_db": os.path.abspath(CHECKPOINT_DB)}
+
+def run_extractions(files, mode):
+    """
+    Extrai os PDFs ainda não concluídos em tarefas de segundo plano (tarefas.py),
+    vários ao mesmo tempo; a extração continua se a página recarregar. O
+    progresso vem dos checkpoints e é mostrado uma vez por execução do script.
+    Retorna {arquivo: [(página, erro)]}, com os erros de página gravados no
+    checkpoint (também os de extrações concluídas antes), ou None enquanto
+    alguma tarefa não termina (quem chama agenda a próxima consulta com
+    wait_and_rerun).
+    """
+    checkpoint = get_checkpoint()
+    queue = get_job_queue()
+    contents = {name: f.getvalue() for name, f in zip(unique_names(files), files)}
+    keys = {name: extraction_key(content, mode) for name, content in contents.items()}
+    pending = [name for name, key in keys.items() if not checkpoint.concluida(key)]
+    polling = st.session_state.pop(POLLING_KEY, False)
+    errors = {name: checkpoint.erros(key) for name, key in keys.items()}
+    if not pending:
+        return errors
+    for name in pending:
+        pages_done, pages_total = checkpoint.progresso(keys[name])
+        if pages_done:
+            st.info(f"↩️ {name}: retomando a extração a partir da página {pages_done + 1}/{pages_total}.")
+
+    # checkpoint incompleto: uma tarefa já concluída para o arquivo é antiga (refazer)
+    jobs = {}
+    for name in pending:
+        params = job_params(contents[name], mode)
+        job_id = id_tarefa(EXTRACTION_JOB, params)
+        if polling and (queue.status(job_id) or {}).get("status") == ERRO:
+            # durante o acompanhamento, uma tarefa com erro não volta para a fila a cada consulta
+            jobs[name] = job_id
+        else:
+            jobs[name] = queue.submeter(EXTRACTION_JOB, refazer=True, **params)
+    progress = st.progress(0.0)
+    status = st.empty()
+    _show_progress(progress, status, checkpoint, {n: keys[n] for n in pending})
+    states = {name: queue.status(job_id) for name, job_id in jobs.items()}
+    if any(job["status"] not in (CONCLUIDA, ERRO) for job in states.values()):
+        return None
+    for name, job in states.items():
+        if job["status"] == ERRO:
+            errors[name] = checkpoint.erros(keys[name]) + [(None, job["erro"])]
+        else:
+            errors[name] = checkpoint.erros(keys[name])
+
+    status.text("✅ Extração finalizada.")
+    progress.empty()
+    return errors
+
+def wait_and_rerun():
+    """Nova execução do script depois de PROGRESS_INTERVAL (próxima consulta às tarefas)."""
+    time.sleep(PROGRESS_INTERVAL)
+    st.session_state[POLLING_KEY] = True
+    st.rerun()
+
+def extract_from_pdfs(files, mode="colunas"):
+    """
+    Extrai todos os PDFs (com retomada pelos checkpoints) e junta as linhas
+    num só DataFrame compacto, com a coluna "Arquivo" indicando a origem
+    (nomes repetidos distinguidos por unique_names). Retorna None enquanto a
+    extração não termina.
+    """
+    errors = run_extractions(files, mode)
+    if errors is None:
+        return None
+    for name, page_errors in errors.items():
+        for page, message in page_errors:
+            where = f"página {page}" if page else "arquivo"
+            st.warning(f"Erro em {name} ({where}): {message}")
+    rows, sources = [], []
+    for name, f in zip(unique_names(files), files):
+        file_rows = get_checkpoint().linhas(extraction_key(f.getvalue(), mode))
+        rows.extend(file_rows)
+        sources.extend([name] * len(file_rows))
+    return rows_to_frame(rows, sources)
+
+def cross_file_duplicates(df):
+    """
+    Registros que aparecem em mais de um arquivo: mesmo nome normalizado
+    (sem acentos, maiúsculas, espaços únicos) e mesma data de nascimento
+    (para datas inválidas, o mesmo texto da data).
+    Retorna (duplicado, repetição): `duplicado` marca todas as ocorrências e
+    `repetição` só as que vêm depois da primeira.
+    """
+    keys = ["Aluno_normalizado", "Data nascimento", RAW_DATE_COLUMN]
+    files_per_key = df.groupby(keys, observed=True, dropna=False)["Arquivo"].transform("nunique")
+    duplicated = files_per_key > 1
+    return duplicated, duplicated & df.duplicated(keys)
 
 # Execução principal
-if uploaded_file is not None:
+if uploaded_files:
+    if st.button("🔄 Extrair novamente do início", help="Descarta o progresso salvo destes arquivos"):
+        for f in uploaded_files:
+            get_checkpoint().descartar(extraction_key(f.getvalue(), extraction_mode))
     st.info("🔧 Processando... isso pode levar alguns segundos dependendo do tamanho do PDF.")
     try:
-        df = extract_from_pdf(uploaded_file)
+        df = extract_from_pdfs(uploaded_files, extraction_mode)
     except Exception as e:
         st.error(f"Erro ao processar o PDF: {e}")
         st.stop()
+    if df is None:
+        wait_and_rerun()
 
     if df.empty:
         st.warning("❗Não foi possível extrair dados. Verifique se o PDF contém texto copiável no formato esperado.")
         st.stop()
 
-    st.success(f"✅ Extração concluída — {len(df)} registros encontrados.")
-    st.dataframe(df.head(200))
+    invalid_dates = df[RAW_DATE_COLUMN].notna()
+    if invalid_dates.any():
+        st.warning(f"📅 {int(invalid_dates.sum())} registro(s) com data de nascimento inválida; "
+                   f"o texto original está na coluna \"{RAW_DATE_COLUMN}\".")
+        st.dataframe(df.loc[invalid_dates, ["Arquivo", "Aluno", RAW_DATE_COLUMN]])
+
+    if len(uploaded_files) > 1:
+        duplicated, repeated = cross_file_duplicates(df)
+        df["Duplicado_entre_arquivos"] = duplicated
+        if repeated.any():
+            st.warning(f"🔁 {int(repeated.sum())} registro(s) repetido(s) em mais de um arquivo (mesmo nome e data de nascimento).")
+            if st.checkbox("Manter só a primeira ocorrência dos repetidos", value=True):
+                df = df[~repeated].reset_index(drop=True)
 
-    # Normalizar para comparações
-    df["Aluno_normalizado"] = df["Aluno"].apply(lambda s: strip_accents(s).upper())
+    st.success(f"✅ Extração concluída — {len(df)} registros encontrados em {len(uploaded_files)} arquivo(s).")
+    st.dataframe(df.drop(columns=["Aluno_normalizado"]).head(200))
+    st.caption(f"💾 Dados em memória: {memory_usage_mb(df):.2f} MB ({len(df)} registros, colunas categóricas e de data compactas)")
 
     # Agrupamento por estado
-    grouped = df.groupby("Estado").agg({
+    grouped = df.groupby("Estado", observed=True).agg({
         "Aluno": lambda x: "; ".join(x.astype(str)),
         "Aluno_normalizado": lambda x: list(x)
     }).rename(columns={"Aluno": "Lista_nomes", "Aluno_normalizado": "Lista_normalizada"})
-    grouped["Contagem"] = df.groupby("Estado")["Aluno"].count()
+    grouped["Contagem"] = df.groupby("Estado", observed=True)["Aluno"].count()
 
     # Geração do Excel
     output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+    with pd.ExcelWriter(output, engine="openpyxl", date_format="DD/MM/YYYY", datetime_format="DD/MM/YYYY") as writer:
         df.drop(columns=["Aluno_normalizado"]).to_excel(writer, index=False, sheet_name="Completa")
         df_state = grouped.reset_index()[["Estado", "Contagem", "Lista_nomes"]]
         df_state.to_excel(writer, index=False, sheet_name="Por_Estado")
@@ -147,7 +250,7 @@ if uploaded_file is not None:
             st.warning("⚠️ Cole ao menos um nome para comparar.")
         else:
             input_names = [ln.strip() for ln in pasted.splitlines() if ln.strip()]
-            input_norm = [(n, strip_accents(n).upper()) for n in input_names]
+            input_norm = [(n, normalize_name(n)) for n in input_names]
             df_names_set = set(df["Aluno_normalizado"].tolist())
 
             matched = []
@@ -186,10 +289,11 @@ if uploaded_file is not None:
 
     st.markdown("---")
     st.markdown(
-        """
+        f"""
 **💡 Dicas para PDFs grandes (100+ páginas):**
 - O processamento pode levar **1–3 minutos**, dependendo da máquina.  
 - Enquanto lê, o app mostra o progresso (%).  
+- O progresso é salvo a cada {PAGES_PER_CHECKPOINT} páginas: se a página recarregar, envie o mesmo PDF e a leitura continua de onde parou.  
 - Evite rodar múltiplas abas Streamlit simultaneamente.  
 - O arquivo Excel final contém todas as páginas, já organizadas.
 """
@@ -1,5 +1,11 @@
+import os
+
 import streamlit as st
 
+from catalogo import (CAMINHO_CATALOGO, IndiceBusca, carregar_catalogo, contagens, html_aplicacoes,
+                      html_links, html_resultados, selo_status, urls)
+from verificador_status import aquecer, verificar
+
 # Configuração inicial
 st.set_page_config(page_title="Repósitorio de Links", layout="centered", page_icon="🗄️")
 
@@ -12,6 +18,52 @@ if senha_digitada != SENHA_CORRETA:
         st.error("Senha incorreta! Acesso negado.")
     st.stop()
 
+@st.cache_data
+def carregar_dados(mtime_catalogo):
+    """Catálogo e totais, lidos uma única vez (relidos quando o catalogo.json muda)."""
+    catalogo = carregar_catalogo()
+    return catalogo, contagens(catalogo)
+
+
+@st.cache_data
+def montar_pagina(mtime_catalogo, selos):
+    """
+    Monta o HTML das duas abas uma única vez para cada combinação de
+    catálogo e selos de status.
+    """
+    catalogo, _ = carregar_dados(mtime_catalogo)
+    return html_aplicacoes(catalogo["aplicacoes"], selos), html_links(catalogo["links"], selos)
+
+
+@st.cache_resource
+def obter_indice(mtime_catalogo):
+    """Índice de busca compartilhado por todas as sessões (remontado se o catálogo mudar)."""
+    catalogo, _ = carregar_dados(mtime_catalogo)
+    return IndiceBusca(catalogo)
+
+
+mtime_catalogo = os.path.getmtime(CAMINHO_CATALOGO)
+catalogo, totais = carregar_dados(mtime_catalogo)
+indice = obter_indice(mtime_catalogo)
+
+# --- STATUS DOS SISTEMAS (opcional, resultados em cache por 5 minutos) ---
+with st.sidebar:
+    st.header("📡 Status")
+    verificar_status = st.checkbox(
+        "Verificar status dos sistemas",
+        value=False,
+        help="Consulta todos os links em paralelo e mostra status e latência em cada cartão."
+    )
+
+status = verificar(urls(catalogo)) if verificar_status else {}
+selos = {url: selo_status(s) for url, s in status.items()}
+dormindo = [url for url, s in status.items() if s.dormindo]
+if dormindo and st.sidebar.button(f"☕ Acordar {len(dormindo)} app(s) dormindo"):
+    aquecer(dormindo)
+    st.sidebar.info("Requisições de aquecimento enviadas; os apps podem levar alguns minutos para subir.")
+
+html_apps, html_ext = montar_pagina(mtime_catalogo, selos)
+
 # CSS personalizado mais limpo
 st.markdown("""
 <style>
@@ -49,6 +101,24 @@ st.markdown("""
         font-size: 1.1em;
         font-weight: bold;
         margin-bottom: 8px;
+        cursor: pointer;
+    }
+    .status-badge {
+        font-size: 0.75em;
+        font-weight: normal;
+        padding: 2px 8px;
+        border-radius: 10px;
+        margin-left: 6px;
+        white-space: nowrap;
+    }
+    .status-ok { background-color: #e8f5e9; color: #2e7d32; }
+    .status-dormindo { background-color: #fff8e1; color: #f57f17; }
+    .status-erro { background-color: #ffebee; color: #c62828; }
+    .app-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+        gap: 10px;
+        align-items: start;
     }
     .link-button {
         background-color: #3498db;
@@ -103,203 +173,32 @@ st.markdown("""
         padding-bottom: 5px;
         border-bottom: 2px solid #3498db;
     }
+    .search-category {
+        font-size: 0.8em;
+        color: #3498db;
+        margin-bottom: 4px;
+    }
 </style>
 """, unsafe_allow_html=True)
 
+# Busca no catálogo (título, descrição e categoria, sem acentos, por prefixo)
+consulta = st.text_input("🔎 Buscar ferramenta ou link", placeholder="Ex.: selic, rubricas, cálculo")
+if consulta.strip():
+    resultados = indice.buscar(consulta)
+    if resultados:
+        st.caption(f"{len(resultados)} resultado(s) para \"{consulta.strip()}\"")
+        st.markdown(html_resultados(resultados, selos), unsafe_allow_html=True)
+    else:
+        st.info("Nenhuma ferramenta ou link encontrado.")
+
 # Sistema de abas
 tab1, tab2 = st.tabs(["🚀 Nossas Aplicações", "🔗 Links Externos Úteis"])
 
 with tab1:
-    # Cabeçalho
-    st.markdown('<div class="main-title">🚀 Repositório de Projetos</div>', unsafe_allow_html=True)
-
-    # Divisão em colunas
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown('<div class="section-title">📊 Ferramentas Previdenciárias</div>', unsafe_allow_html=True)
-        
-        # Buscador de Rubricas
-        with st.expander("🔍 Buscador de Rubricas no HISCRE", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Informe até 4 rubricas específicas para buscar | Organiza em ordem cronológica por competência | Você pode baixar o resultado em CSV
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://07-buscador-de-rubricas.streamlit.app/" target="_blank"><button class="link-button">Acessar Ferramenta</button></a>', unsafe_allow_html=True)
-        
-        # Cálculo de Multa
-        with st.expander("📅 Cálculo de Multa Diária Corrigida", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Adicione faixas de multa com valores diferentes. O total por mês será corrigido por índice informado manualmente ou automaticamente pela SELIC.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://02-calculo-da-multa.streamlit.app/" target="_blank"><button class="link-button">Acessar Calculadora</button></a>', unsafe_allow_html=True)
-        
-        # Cálculo de Multa V2
-        with st.expander("📅 Cálculo de Multa Diária (Versão 2)", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Versão alternativa da calculadora de multa com funcionalidades adicionais.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://03-calculomulta.streamlit.app/" target="_blank"><button class="link-button">Acessar Calculadora V2</button></a>', unsafe_allow_html=True)
-        
-        # Benefício Redutor
-        with st.expander("📊 Cálculo de Acumulação de Benefícios", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Calculadora conforme as regras de redução na acumulação de benefícios (EC 103/2019). Quando uma pessoa tem direito a receber dois benefícios previdenciários ao mesmo tempo.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://01-beneficioredutoracmulacao.streamlit.app/" target="_blank"><button class="link-button">Acessar Calculadora</button></a>', unsafe_allow_html=True)
-        
-        # Acumulação de Benefícios
-        with st.expander("📊 Acumulação de Benefícios (Versão 2)", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Calculadora conforme as regras de redução na acumulação de benefícios (EC 103/2019).
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://06-acmulacao-de-beneficios.streamlit.app/" target="_blank"><button class="link-button">Acessar Calculadora V2</button></a>', unsafe_allow_html=True)
-
-    with col2:
-        st.markdown('<div class="section-title">⚙️ Ferramentas Técnicas e Produtividade</div>', unsafe_allow_html=True)
-        
-        # Desbloqueador VBA
-        with st.expander("🔓 Desbloqueador de Projetos VBA Excel", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Ferramenta para desbloquear e recuperar projetos VBA no Excel.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://04-quebrasenhavba.streamlit.app/" target="_blank"><button class="link-button">Acessar Ferramenta</button></a>', unsafe_allow_html=True)
-        
-        # Sistema AnaClara 1
-        with st.expander("✨ Sistema AnaClara - Cálculo Trabalhista", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Sistema com verificação da periculosidade para cálculo de adicionais trabalhistas.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://01-anaclara.streamlit.app/" target="_blank"><button class="link-button">Acessar Sistema</button></a>', unsafe_allow_html=True)
-        
-        # Sistema AnaClara 2
-        with st.expander("⭐ Sistema AnaClara (Versão 2)", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Versão alternativa do sistema de cálculo de adicionais trabalhistas.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://02-anaclara.streamlit.app/" target="_blank"><button class="link-button">Acessar Sistema V2</button></a>', unsafe_allow_html=True)
-        
-        # Sistema AnaClara 3
-        with st.expander("🚀 Sistema AnaClara (Versão 3)", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Versão mais avançada do sistema de cálculo de adicionais trabalhistas.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://03-anaclara.streamlit.app/" target="_blank"><button class="link-button">Acessar Sistema V3</button></a>', unsafe_allow_html=True)
-        
-        # Calculadora de IR 2024
-        with st.expander("💰 Calculadora de IR 2024", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Cálculo de INSS e IR usando métodos tradicional e simplificado | Comparação entre os métodos | Tabelas de referência
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://05-planilhair24.streamlit.app/" target="_blank"><button class="link-button">Acessar Calculadora</button></a>', unsafe_allow_html=True)
-        
-        # Sistema de Triagem
-        with st.expander("⚖️ Sistema de Triagem de Processos", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Sistema completo para gestão e triagem de processos judiciais com relatórios PDF e atribuição de servidores.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://08-triagem-27do10-10e49.streamlit.app/" target="_blank"><button class="link-button">Acessar Sistema</button></a>', unsafe_allow_html=True)
-
-    # Nova seção para ferramentas de imagem
-    st.markdown('<div class="section-title">🖼️ Ferramentas de Imagem e PDF</div>', unsafe_allow_html=True)
-
-    col3, col4, col5 = st.columns(3)
-
-    with col3:
-        with st.expander("📄 Imagem para PDF", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Converta imagens para formato PDF de maneira rápida e prática.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://01-imagem-para-pdf.streamlit.app/" target="_blank"><button class="link-button">Acessar Conversor</button></a>', unsafe_allow_html=True)
-
-    with col4:
-        with st.expander("📷 Fotos 3x4 em 10x15", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Transforme qualquer foto em 3x4 e num grid de 10x15 cm, prontas para impressão.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://02-fotos3x4em10x15maispola.streamlit.app/" target="_blank"><button class="link-button">Acessar Ferramenta</button></a>', unsafe_allow_html=True)
-
-    with col5:
-        with st.expander("🖼️ Fotos Multi-Formato", expanded=False):
-            st.markdown("""
-            <div class="description-box">
-            Ferramenta para trabalhar com fotos em múltiplos formatos e tamanhos.
-            </div>
-            """, unsafe_allow_html=True)
-            st.markdown('<a href="https://03-fotos-multi-formato.streamlit.app/" target="_blank"><button class="link-button">Acessar Ferramenta</button></a>', unsafe_allow_html=True)
+    st.markdown('<div class="main-title">🚀 Repositório de Projetos</div>' + html_apps, unsafe_allow_html=True)
 
 with tab2:
-    st.markdown('<div class="main-title">🔗 Links Externos Úteis</div>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="link-category">🏛️ Sistemas Judiciários</div>', unsafe_allow_html=True)
-        
-        # Sistemas Judiciários
-        sistemas_links = [
-            ("PJE TRF5", "https://pje1g.trf5.jus.br/pje/ng2/dev.seam#/painel-usuario-interno", "Sistema Processo Judicial Eletrônico"),
-            ("Ponto Eletrônico", "https://ponto.jfpe.jus.br/Login", "Sistema de ponto eletrônico"),
-            ("Controle de Cheques", "https://ccheque.jfpe.jus.br/views/login.php", "Sistema de controle de cheques"),
-            ("SEI TRF5", "https://sip.trf5.jus.br/sip/login.php?sigla_orgao_sistema=TRF5&sigla_sistema=SEI&infra_url=L3NlaS8=", "Sistema Eletrônico de Informações"),
-            ("PJE Previdenciário", "https://sso.cloud.pje.jus.br/auth/realms/pje/protocol/openid-connect/auth?client_id=previdenciario-frontend&redirect_uri=https%3A%2F%2Fprevidenciario.pdpj.jus.br%2F&state=39d9a1a4-e678-4e0e-85f7-85899a8b5f43&response_mode=fragment&response_type=code&scope=openid&nonce=cdcf49e9-c3f5-425b-8bb2-cb5e7a5935d0", "PJE Especializado em Previdenciário"),
-            ("CNJ - Movimentos", "https://www.cnj.jus.br/sgt/consulta_publica_movimentos.php", "Consulta pública de movimentos processuais"),
-            ("SICOM - Correção Monetária", "https://sicom.cjf.jus.br/tabelaCorMor.php", "Tabelas de correção monetária e mora")
-        ]
-        
-        for nome, url, descricao in sistemas_links:
-            with st.container():
-                st.markdown(f'<div class="external-link-card">', unsafe_allow_html=True)
-                st.markdown(f'**{nome}**')
-                st.markdown(f'<div class="description-box">{descricao}</div>', unsafe_allow_html=True)
-                st.markdown(f'<a href="{url}" target="_blank"><button class="link-button">Acessar Sistema</button></a>', unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="link-category">📈 Sistemas Previdenciários e Fiscais</div>', unsafe_allow_html=True)
-        
-        # Sistemas Previdenciários
-        prev_links = [
-            ("Gerir INSS", "https://geridinss.dataprev.gov.br/cas/login", "Sistema de gerenciamento do INSS"),
-            ("SIBE INSS", "https://sibe.inss.gov.br/", "Sistema de Benefícios do INSS"),
-            ("Simulador IRPF", "https://www27.receita.fazenda.gov.br/simulador-irpf/", "Simulador do Imposto de Renda"),
-            ("Sicalc - SELIC", "https://sicalc.receita.economia.gov.br/sicalc/selic/consulta", "Calculadora de juros SELIC"),
-            ("Calculadora Cidadão BC", "https://www3.bcb.gov.br/CALCIDADAO/publico/exibirFormCorrecaoValores.do?method=exibirFormCorrecaoValores", "Correção de valores pelo BACEN"),
-            ("IBGE - Índices", "https://www.ibge.gov.br/estatisticas/economicas/precos-e-custos/9258-indice-nacional-de-precos-ao-consumidor.html?=&t=resultados", "Índices nacionais de preços")
-        ]
-        
-        for nome, url, descricao in prev_links:
-            with st.container():
-                st.markdown(f'<div class="external-link-card">', unsafe_allow_html=True)
-                st.markdown(f'**{nome}**')
-                st.markdown(f'<div class="description-box">{descricao}</div>', unsafe_allow_html=True)
-                st.markdown(f'<a href="{url}" target="_blank"><button class="link-button">Acessar Sistema</button></a>', unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div class="main-title">🔗 Links Externos Úteis</div>' + html_ext, unsafe_allow_html=True)
 
 # Rodapé simplificado
 st.markdown("---")
@@ -310,8 +209,13 @@ with col_contact1:
     st.markdown("**🌐 Suporte:** [WhatsApp](https://l1nk.dev/WVtgy)")
 
 with col_contact2:
-    st.markdown("**📊 Status:** ✅ Todos operacionais")
-    st.markdown("**📦 Total de Projetos:** 14")
+    if status:
+        operacionais = sum(1 for s in status.values() if s.ok)
+        icone = "✅" if operacionais == len(status) else "⚠️"
+        st.markdown(f"**📊 Status:** {icone} {operacionais}/{len(status)} operacionais")
+    else:
+        st.markdown("**📊 Status:** não verificado (ative na barra lateral)")
+    st.markdown(f"**📦 Total de Projetos:** {totais['projetos']}")
 
 # Sidebar minimalista
 with st.sidebar:
@@ -319,9 +223,9 @@ with st.sidebar:
     st.markdown("Este repositório contém todas as ferramentas e sistemas desenvolvidos.")
     
     st.header("📈 Estatísticas")
-    st.metric("Projetos Ativos", "14")
-    st.metric("Links Externos", "13")
-    st.metric("Categorias", "4")
+    st.metric("Projetos Ativos", totais["projetos"])
+    st.metric("Links Externos", totais["links"])
+    st.metric("Categorias", totais["categorias"])
     
     st.header("🔔 Atualizações")
     st.info("""
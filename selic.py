@@ -0,0 +1,203 @@
+"""
+Série mensal da taxa SELIC (selic.csv) indexada por mês.
+
+O arquivo tem o formato exportado pelas planilhas de cálculo:
+
+    MesAno;Taxa
+    fev/95;0,0363
+
+(separador ';', vírgula decimal, BOM no início e taxas em fração: 0,0363 = 3,63%).
+O arquivo é lido uma única vez por processo; a série fica num array NumPy
+somente leitura, em que a posição de cada mês é calculada diretamente a
+partir do ordinal (ano * 12 + mês - 1). Assim, a consulta de um mês ou de um
+período inteiro é feita em tempo constante.
+
+Taxa zero no arquivo não é taxa real: os meses futuros preenchidos com zero
+no fim do arquivo, e também zeros no início (jan/95) ou isolados no meio, são
+marcados em `placeholder` e têm valor NaN em `taxas`. Os zeros iniciais são
+descartados (a série começa no primeiro mês com taxa).
+"""
+
+import csv
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "selic.csv")
+# Base versionada gerada por selic_store.py (preferida quando existe)
+CAMINHO_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "selic_store.npz")
+
+MESES = {
+    "jan": 1, "fev": 2, "mar": 3, "abr": 4, "mai": 5, "jun": 6,
+    "jul": 7, "ago": 8, "set": 9, "out": 10, "nov": 11, "dez": 12,
+}
+NOMES_MESES = {v: k for k, v in MESES.items()}
+
+
+def ordinal_mes(ano, mes):
+    """Número sequencial do mês (ano * 12 + mês - 1)."""
+    return ano * 12 + mes - 1
+
+
+def mes_do_ordinal(ordinal):
+    """Inverso de ordinal_mes: devolve (ano, mês)."""
+    ano, resto = divmod(int(ordinal), 12)
+    return ano, resto + 1
+
+
+def parse_mes_ano(texto):
+    """
+    Converte 'fev/95', 'fev/2024', '02/2024' ou '2024-02' em (ano, mês).
+    Anos com dois dígitos: 90-99 -> 1990-1999, demais -> 2000-2089.
+    """
+    texto = texto.strip().lower()
+    if "-" in texto:
+        ano, mes = texto.split("-")[:2]
+    else:
+        mes, ano = texto.split("/")
+    mes = MESES[mes[:3]] if mes[:3] in MESES else int(mes)
+    ano = int(ano)
+    if ano < 100:
+        ano += 1900 if ano >= 90 else 2000
+    if not 1 <= mes <= 12:
+        raise ValueError(f"Mês inválido: {texto!r}")
+    return ano, mes
+
+
+def como_ordinal(mes):
+    """
+    Aceita (ano, mês), date/datetime/Timestamp, texto ('fev/95', '02/2024')
+    ou um ordinal já calculado (int) e devolve o ordinal do mês.
+    """
+    if isinstance(mes, (int, np.integer)):
+        return int(mes)
+    if isinstance(mes, str):
+        return ordinal_mes(*parse_mes_ano(mes))
+    if isinstance(mes, tuple):
+        return ordinal_mes(*mes)
+    return ordinal_mes(mes.year, mes.month)
+
+
+def formatar_mes(mes):
+    """Ordinal (ou outro formato aceito) -> 'fev/2024'."""
+    ano, m = mes_do_ordinal(como_ordinal(mes))
+    return f"{NOMES_MESES[m]}/{ano}"
+
+
+@dataclass(frozen=True, eq=False)
+class SerieSelic:
+    """
+    Série mensal contígua a partir do mês `inicio` (ordinal).
+
+    - taxas: fração mensal (NaN nos meses sem taxa publicada)
+    - placeholder: True nos meses preenchidos com zero no arquivo
+    - ultimo_real: ordinal do último mês com taxa publicada
+    """
+
+    inicio: int
+    taxas: np.ndarray
+    placeholder: np.ndarray
+    ultimo_real: int
+
+    @property
+    def fim(self):
+        """Ordinal do último mês da série (incluindo placeholders)."""
+        return self.inicio + len(self.taxas) - 1
+
+    def posicao(self, mes):
+        """Posição do mês no array (ValueError se fora da série)."""
+        pos = como_ordinal(mes) - self.inicio
+        if not 0 <= pos < len(self.taxas):
+            raise ValueError(
+                f"Mês {formatar_mes(mes)} fora da série "
+                f"({formatar_mes(self.inicio)} a {formatar_mes(self.fim)})"
+            )
+        return pos
+
+    def taxa(self, mes):
+        """Taxa do mês (NaN se ainda não publicada)."""
+        return float(self.taxas[self.posicao(mes)])
+
+    def eh_placeholder(self, mes):
+        return bool(self.placeholder[self.posicao(mes)])
+
+    def periodo(self, inicio, fim):
+        """Taxas de `inicio` a `fim` (inclusive), como view do array (sem cópia)."""
+        a, b = self.posicao(inicio), self.posicao(fim)
+        if b < a:
+            raise ValueError("O mês final é anterior ao inicial")
+        return self.taxas[a:b + 1]
+
+    def ordinais(self):
+        """Ordinais de todos os meses da série."""
+        return np.arange(self.inicio, self.fim + 1)
+
+
+def _somente_leitura(array):
+    array.setflags(write=False)
+    return array
+
+
+def montar_serie(meses, taxas):
+    """
+    Monta a SerieSelic a partir de listas (ordinal, taxa) em ordem.
+    Zeros são meses sem taxa: os iniciais são descartados e os demais (meses
+    futuros ou lacunas) viram placeholders.
+    """
+    meses = np.asarray(meses, dtype=np.int64)
+    taxas = np.asarray(taxas, dtype=np.float64)
+    if len(meses) == 0:
+        raise ValueError("Série SELIC vazia")
+    if np.any(np.diff(meses) != 1):
+        raise ValueError("A série SELIC deve ter meses consecutivos, sem lacunas")
+
+    reais = np.flatnonzero(taxas != 0)
+    if len(reais):
+        meses, taxas = meses[reais[0]:], taxas[reais[0]:]
+        reais = reais - reais[0]
+    ultimo = reais[-1] if len(reais) else -1
+    placeholder = taxas == 0
+    taxas = taxas.copy()
+    taxas[placeholder] = np.nan
+    return SerieSelic(
+        inicio=int(meses[0]),
+        taxas=_somente_leitura(taxas),
+        placeholder=_somente_leitura(placeholder),
+        ultimo_real=int(meses[0] + ultimo),
+    )
+
+
+def ler_csv(caminho):
+    """Lê o selic.csv (MesAno;Taxa) e devolve (ordinais, taxas)."""
+    meses, taxas = [], []
+    with open(caminho, encoding="utf-8-sig", newline="") as f:
+        leitor = csv.reader(f, delimiter=";")
+        next(leitor, None)  # cabeçalho
+        for linha in leitor:
+            if not linha or not linha[0].strip():
+                continue
+            meses.append(ordinal_mes(*parse_mes_ano(linha[0])))
+            taxas.append(float(linha[1].strip().replace(",", ".")))
+    return meses, taxas
+
+
+@lru_cache(maxsize=8)
+def _carregar(caminho, _mtime):
+    return montar_serie(*ler_csv(caminho))
+
+
+def carregar_serie(caminho=None):
+    """
+    Série SELIC do arquivo, lida uma única vez por processo (o cache é
+    invalidado se o arquivo for alterado). Sem caminho, usa a base versionada
+    (selic_store.npz) quando ela existe e, senão, o selic.csv.
+    """
+    if caminho is None:
+        caminho = CAMINHO_STORE if os.path.exists(CAMINHO_STORE) else CAMINHO_PADRAO
+    if caminho.endswith(".npz"):
+        from selic_store import carregar_serie_store
+        return carregar_serie_store(caminho)
+    caminho = os.path.abspath(caminho)
+    return _carregar(caminho, os.path.getmtime(caminho))
@@ -0,0 +1,201 @@
+"""
+Base local versionada da taxa SELIC mensal (substitui a leitura do selic.csv).
+
+A base é um arquivo binário compacto (.npz) com os meses (ordinais), as taxas
+(fração mensal) e metadados: versão, hash do conteúdo, último mês real, data
+da atualização e origem. Somente meses com taxa publicada são gravados.
+
+A atualização é feita sem internet, a partir do arquivo exportado do
+Banco Central (SGS, série 4390 — SELIC acumulada no mês, em %), em JSON
+
+    [{"data": "01/01/2024", "valor": "0.97"}, ...]
+
+ou CSV ("data";"valor" com vírgula decimal). Só os meses posteriores ao último
+mês da base são acrescentados; meses já gravados não são reescritos (se o
+arquivo trouxer valor diferente para um mês existente, a importação é
+recusada). Taxa zero é mês sem taxa: na base, é preenchida pelo arquivo; no
+arquivo, é ignorada.
+
+Leitura: carregar_serie_store() devolve uma SerieSelic com arrays somente
+leitura, lida uma única vez por processo e compartilhada pelas sessões.
+
+Linha de comando:
+
+    python selic_store.py importar bcb_4390.json
+    python selic_store.py info
+"""
+
+import argparse
+import csv
+import datetime
+import hashlib
+import io
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from selic import CAMINHO_PADRAO, CAMINHO_STORE, formatar_mes, ler_csv, montar_serie, ordinal_mes
+
+TOLERANCIA = 1e-9
+
+
+def hash_conteudo(meses, taxas):
+    """SHA-256 dos arrays de meses e taxas (identifica a versão dos dados)."""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(meses, dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(taxas, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def ler_store(caminho=CAMINHO_STORE):
+    """Lê a base e devolve (meses, taxas, metadados), conferindo o hash."""
+    with np.load(caminho, allow_pickle=False) as dados:
+        meses = dados["meses"]
+        taxas = dados["taxas"]
+        meta = json.loads(str(dados["meta"]))
+    if hash_conteudo(meses, taxas) != meta["hash"]:
+        raise ValueError(f"Base SELIC corrompida: hash não confere ({caminho})")
+    return meses, taxas, meta
+
+
+def gravar_store(meses, taxas, caminho=CAMINHO_STORE, versao=1, origem=""):
+    """Grava a base de forma atômica (arquivo temporário + os.replace)."""
+    meses = np.asarray(meses, dtype=np.int64)
+    taxas = np.asarray(taxas, dtype=np.float64)
+    meta = {
+        "versao": versao,
+        "hash": hash_conteudo(meses, taxas),
+        "primeiro_mes": formatar_mes(int(meses[0])),
+        "ultimo_real": formatar_mes(int(meses[-1])),
+        "atualizado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+        "origem": origem,
+    }
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as f:
+        np.savez_compressed(f, meses=meses, taxas=taxas, meta=np.array(json.dumps(meta)))
+    os.replace(temporario, caminho)
+    return meta
+
+
+def _somente_reais(meses, taxas):
+    # descarta os zeros iniciais e finais (meses sem taxa: jan/95, meses futuros)
+    taxas = np.asarray(taxas, dtype=np.float64)
+    reais = np.flatnonzero(taxas != 0)
+    inicio, fim = (reais[0], reais[-1] + 1) if len(reais) else (0, 0)
+    return np.asarray(meses, dtype=np.int64)[inicio:fim], taxas[inicio:fim]
+
+
+def criar_store_do_csv(arquivo_csv=CAMINHO_PADRAO, caminho=CAMINHO_STORE):
+    """Cria a base a partir do selic.csv (apenas os meses com taxa publicada)."""
+    meses, taxas = _somente_reais(*ler_csv(arquivo_csv))
+    return gravar_store(meses, taxas, caminho, versao=1, origem=os.path.basename(arquivo_csv))
+
+
+def _mes_bcb(data):
+    # datas do SGS: dd/mm/aaaa (sempre o dia 01)
+    _, mes, ano = data.strip().split("/")
+    return ordinal_mes(int(ano), int(mes))
+
+
+def ler_exportacao_bcb(conteudo):
+    """
+    Interpreta a exportação do SGS (JSON ou CSV) e devolve (meses, taxas)
+    ordenados, com as taxas em fração (o SGS publica em %).
+    """
+    if isinstance(conteudo, bytes):
+        conteudo = conteudo.decode("utf-8-sig")
+    conteudo = conteudo.lstrip("\ufeff").strip()
+    if conteudo.startswith("["):
+        registros = [(r["data"], str(r["valor"])) for r in json.loads(conteudo)]
+    else:
+        leitor = csv.reader(io.StringIO(conteudo), delimiter=";")
+        next(leitor, None)  # cabeçalho "data";"valor"
+        registros = [(l[0], l[1]) for l in leitor if l and l[0].strip()]
+
+    pares = sorted((_mes_bcb(d), float(v.replace(",", ".")) / 100) for d, v in registros)
+    meses = np.array([m for m, _ in pares], dtype=np.int64)
+    taxas = np.array([t for _, t in pares], dtype=np.float64)
+    return meses, taxas
+
+
+def importar_bcb(arquivo, caminho=CAMINHO_STORE):
+    """
+    Acrescenta à base os meses novos do arquivo do Banco Central.
+    Retorna os metadados da nova versão (ou da atual, se nada mudou).
+    """
+    with open(arquivo, "rb") as f:
+        novos_meses, novas_taxas = ler_exportacao_bcb(f.read())
+    if not os.path.exists(caminho):
+        criar_store_do_csv(caminho=caminho)
+    meses, taxas, meta = ler_store(caminho)
+
+    # meses já existentes: devem conferir com a base (histórico não é reescrito);
+    # zeros, na base ou no arquivo, são meses sem taxa e ficam fora da conferência
+    comuns = novos_meses <= meses[-1]
+    dentro = comuns & (novos_meses >= meses[0])
+    pos = novos_meses[dentro] - meses[0]
+    atuais, novas = taxas[pos], novas_taxas[dentro]
+    divergentes = (atuais != 0) & (novas != 0) & (np.abs(atuais - novas) > TOLERANCIA)
+    if np.any(divergentes):
+        mes = int(novos_meses[dentro][divergentes][0])
+        raise ValueError(f"Taxa de {formatar_mes(mes)} diverge da base; o histórico não é reescrito")
+    # meses sem taxa na base são preenchidos pelo arquivo
+    preencher = (atuais == 0) & (novas != 0)
+    if np.any(preencher):
+        taxas = taxas.copy()
+        taxas[pos[preencher]] = novas[preencher]
+
+    acrescimo_meses = novos_meses[~comuns]
+    acrescimo_taxas = novas_taxas[~comuns]
+    reais = np.flatnonzero(acrescimo_taxas != 0)
+    fim = reais[-1] + 1 if len(reais) else 0  # zeros finais: meses futuros
+    acrescimo_meses, acrescimo_taxas = acrescimo_meses[:fim], acrescimo_taxas[:fim]
+    if len(acrescimo_meses) == 0 and not np.any(preencher):
+        return meta
+    if len(acrescimo_meses) and (acrescimo_meses[0] != meses[-1] + 1 or np.any(np.diff(acrescimo_meses) != 1)):
+        raise ValueError(
+            f"O arquivo deixa lacunas após {formatar_mes(int(meses[-1]))}; exporte a série a partir do mês seguinte"
+        )
+    return gravar_store(
+        np.concatenate([meses, acrescimo_meses]),
+        np.concatenate([taxas, acrescimo_taxas]),
+        caminho,
+        versao=meta["versao"] + 1,
+        origem=os.path.basename(arquivo),
+    )
+
+
+@lru_cache(maxsize=8)
+def _carregar(caminho, _mtime):
+    meses, taxas, _ = ler_store(caminho)
+    return montar_serie(meses, taxas)
+
+
+def carregar_serie_store(caminho=CAMINHO_STORE):
+    """SerieSelic da base local (cache por processo; recarrega se o arquivo mudar)."""
+    caminho = os.path.abspath(caminho)
+    return _carregar(caminho, os.path.getmtime(caminho))
+
+
+def metadados(caminho=CAMINHO_STORE):
+    return ler_store(caminho)[2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Base local versionada da SELIC mensal")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_importar = sub.add_parser("importar", help="Acrescenta meses de um arquivo exportado do SGS/BCB")
+    p_importar.add_argument("arquivo")
+    sub.add_parser("criar", help="(Re)cria a base a partir do selic.csv")
+    sub.add_parser("info", help="Mostra os metadados da base")
+    args = parser.parse_args()
+
+    if args.comando == "importar":
+        meta = importar_bcb(args.arquivo)
+    elif args.comando == "criar":
+        meta = criar_store_do_csv()
+    else:
+        meta = metadados()
+    print(json.dumps(meta, ensure_ascii=False, indent=2))
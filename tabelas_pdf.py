@@ -0,0 +1,239 @@
+"""
+Extração de tabelas de PDFs (pdfplumber), sem dependência do Streamlit.
+
+Usada pelo app pdf_extract.py, pelo buscador do HISCRE (hiscre.py) e pelas
+tarefas em segundo plano (tarefas_extracao.py). O pdfplumber só é importado
+na primeira extração: quem usa apenas TableRecord ou combine_all_tables (e o
+worker que recebe o resultado) não paga o import.
+"""
+
+import hashlib
+import logging
+import re
+
+import pandas as pd
+
+_log = logging.getLogger(__name__)
+
+def detect_date_column(column_data):
+    """Detecta se uma coluna contém datas no formato MM/AAAA"""
+    date_pattern = r'^\d{1,2}/\d{4}$'
+    date_count = 0
+    total_non_empty = 0
+    
+    for value in column_data:
+        if pd.notna(value) and str(value).strip():
+            total_non_empty += 1
+            if re.match(date_pattern, str(value).strip()):
+                date_count += 1
+    
+    # Se mais de 80% dos valores não vazios são datas, considera como coluna de data
+    if total_non_empty > 0 and (date_count / total_non_empty) > 0.8:
+        return True
+    return False
+
+def detect_header_row(table_data):
+    """Detecta automaticamente a linha do cabeçalho"""
+    if not table_data or len(table_data) < 2:
+        return 0
+    
+    # Verificar se a primeira linha parece ser cabeçalho
+    first_row = table_data[0]
+    second_row = table_data[1]
+    
+    # Critérios para identificar cabeçalho:
+    # 1. Se a primeira linha contém principalmente texto e a segunda contém datas/números
+    # 2. Se a primeira linha tem muitos valores vazios/nulos (provavelmente não é cabeçalho)
+    # 3. Se a segunda linha começa com uma data
+    
+    first_row_non_empty = sum(1 for cell in first_row if cell and str(cell).strip())
+    
+    # Se a primeira linha tem poucos valores não vazios, provavelmente não é cabeçalho
+    if first_row_non_empty < len(first_row) * 0.3:
+        return 0  # Não tem cabeçalho
+    
+    # Verificar se a segunda linha começa com data
+    if second_row and second_row[0] and detect_date_column([second_row[0]]):
+        return 0  # Não tem cabeçalho, dados começam na primeira linha
+    
+    # Verificar se a primeira linha parece ter nomes de colunas (texto mais descritivo)
+    first_row_has_text = sum(1 for cell in first_row if cell and any(c.isalpha() for c in str(cell)))
+    second_row_has_numbers = sum(1 for cell in second_row if cell and any(c.isdigit() for c in str(cell)))
+    
+    if first_row_has_text > second_row_has_numbers:
+        return 0  # Primeira linha é provavelmente cabeçalho
+    else:
+        return -1  # Não tem cabeçalho claro
+
+def clean_column_names(columns):
+    """Limpa e corrige nomes de colunas duplicados"""
+    seen = {}
+    cleaned_columns = []
+    
+    for i, col in enumerate(columns):
+        if col is None or col == '':
+            col = f'Coluna_{i+1}'
+        elif col in seen:
+            seen[col] += 1
+            col = f'{col}_{seen[col]}'
+        else:
+            seen[col] = 1
+        cleaned_columns.append(col)
+    
+    return cleaned_columns
+
+def generate_column_names(num_columns, first_row_data=None):
+    """Gera nomes de colunas baseados no conteúdo ou sequenciais"""
+    columns = []
+    
+    if first_row_data and any(first_row_data):
+        # Tentar usar a primeira linha como base para nomes
+        for i, cell in enumerate(first_row_data):
+            if cell and str(cell).strip():
+                # Verificar se é data - se for, usar nome padrão
+                if detect_date_column([cell]):
+                    columns.append('Data')
+                else:
+                    columns.append(f'Coluna_{i+1}_{str(cell)[:20]}')
+            else:
+                columns.append(f'Coluna_{i+1}')
+    else:
+        # Nomes sequenciais
+        columns = [f'Coluna_{i+1}' for i in range(num_columns)]
+    
+    return clean_column_names(columns)
+
+def table_fingerprint(table):
+    """
+    Impressão digital do conteúdo bruto de uma tabela. Espaços e maiúsculas
+    são normalizados e linhas vazias ignoradas, para que repetições quase
+    idênticas (mesma legenda em todas as páginas) tenham o mesmo hash.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for row in table:
+        cells = [' '.join(str(cell).split()).casefold() if cell is not None else '' for cell in row]
+        if any(cells):
+            digest.update('\x1f'.join(cells).encode('utf-8'))
+            digest.update(b'\x1e')
+    return digest.hexdigest()
+
+class TableRecord:
+    """Tabela extraída e seus metadados, guardados uma única vez por tabela (não por linha)"""
+    __slots__ = ('data', 'page', 'table', 'has_header', 'pages')
+
+    def __init__(self, data, page, table, has_header):
+        self.data = data
+        self.page = page
+        self.table = table
+        self.has_header = has_header
+        self.pages = [page]  # páginas em que a mesma tabela aparece
+
+    @property
+    def table_id(self):
+        return f"p{self.page}_t{self.table}"
+
+    @property
+    def pages_label(self):
+        return ", ".join(str(p) for p in self.pages)
+
+    def __repr__(self):
+        return f"TableRecord({self.table_id}, {self.data.shape[0]}×{self.data.shape[1]}, has_header={self.has_header})"
+
+def extract_tables_from_pdf(pdf_file, deduplicate=True, on_progress=None, on_error=None):
+    """
+    Extrai todas as tabelas de um arquivo PDF com detecção inteligente de cabeçalhos.
+    Retorna uma lista de TableRecord (página, número e cabeçalho ficam no registro).
+
+    Com `deduplicate`, tabelas repetidas (mesma impressão digital) viram um só
+    registro com a lista de páginas, sem nova detecção de cabeçalho nem DataFrame.
+    `on_progress(paginas_lidas, total)` é chamado a cada página; os erros vão
+    para `on_error(mensagem)` (padrão: log de aviso).
+    """
+    import pdfplumber
+
+    on_error = on_error or _log.warning
+    tables = []
+    seen = {}  # impressão digital -> TableRecord (None se a tabela foi descartada)
+    with pdfplumber.open(pdf_file) as pdf:
+        for page_num, page in enumerate(pdf.pages):
+            if on_progress is not None and page_num:
+                on_progress(page_num, len(pdf.pages))
+            try:
+                # Extrair tabelas da página
+                page_tables = page.extract_tables()
+                
+                for table_num, table in enumerate(page_tables):
+                    if table and len(table) > 1:  # Ignorar tabelas vazias ou com apenas uma linha
+                        if deduplicate:
+                            fingerprint = table_fingerprint(table)
+                            if fingerprint in seen:
+                                if seen[fingerprint] is not None:
+                                    seen[fingerprint].pages.append(page_num + 1)
+                                continue
+                        
+                        try:
+                            # Detectar se tem cabeçalho
+                            header_row_index = detect_header_row(table)
+                            
+                            if header_row_index == 0:
+                                # Tem cabeçalho na primeira linha
+                                headers = table[0]
+                                data_rows = table[1:]
+                            else:
+                                # Não tem cabeçalho claro - gerar nomes automaticamente
+                                headers = generate_column_names(len(table[0]), table[0])
+                                data_rows = table
+                            
+                            # Limpar nomes de colunas
+                            cleaned_headers = clean_column_names(headers)
+                            
+                            # Converter para DataFrame
+                            df = pd.DataFrame(data_rows, columns=cleaned_headers)
+                            
+                            # Remover linhas completamente vazias
+                            df = df.dropna(how='all')
+                            
+                            # Remover colunas completamente vazias
+                            df = df.dropna(axis=1, how='all')
+                            
+                            record = TableRecord(df, page_num + 1, table_num + 1, header_row_index == 0) if not df.empty else None
+                            if record is not None:
+                                tables.append(record)
+                            if deduplicate:
+                                seen[fingerprint] = record
+                                
+                        except Exception as e:
+                            on_error(f"⚠️ Erro na tabela {table_num+1} da página {page_num+1}: {str(e)}")
+                            continue
+                            
+            except Exception as e:
+                on_error(f"⚠️ Erro na página {page_num+1}: {str(e)}")
+                continue
+        if on_progress is not None:
+            on_progress(len(pdf.pages), len(pdf.pages))
+                
+    return tables
+
+def combine_all_tables(extracted_data):
+    """
+    Combina todas as tabelas em um único DataFrame. `extracted_data` é
+    {nome: (TableRecord, DataFrame)}; as colunas de origem são acrescentadas aqui.
+    """
+    combined_dfs = [
+        df.assign(Fonte_Tabela=table_name, Pagina=record.pages_label, Tabela=record.table)
+        for table_name, (record, df) in extracted_data.items()
+    ]
+    
+    if combined_dfs:
+        return pd.concat(combined_dfs, ignore_index=True)
+    return pd.DataFrame()
+
+def _numeric_or_original(column):
+    try:
+        return pd.to_numeric(column)
+    except (ValueError, TypeError):
+        return column
+
+def infer_numeric_types(df):
+    """Converte para número as colunas que forem inteiramente numéricas (sem copiar as demais)"""
+    return df.apply(_numeric_or_original)
@@ -0,0 +1,326 @@
+"""
+Tarefas longas (extrações de PDF) executadas fora da execução do script Streamlit.
+
+Os apps registram a tarefa numa tabela SQLite local e acompanham o status e
+o progresso sem bloquear a sessão; um rerun ou a troca de widget não
+interrompe a tarefa. Um processo "worker" (python tarefas.py worker), iniciado
+sob demanda pelo primeiro app que precisar dele, executa as tarefas num
+ProcessPoolExecutor, vários PDFs ao mesmo tempo, mesmo de usuários diferentes.
+
+Uma tarefa é uma função importável ("modulo:funcao") chamada como
+funcao(contexto, **parametros); o contexto informa o progresso. O resultado
+é gravado (pickle) na pasta de dados e fica disponível para reuso: a mesma
+função com os mesmos parâmetros tem o mesmo id e não é executada de novo.
+Arquivos enviados pelos usuários são passados pelo caminho (salvar_entrada).
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+CAMINHO_DB = "tarefas.sqlite3"
+DIRETORIO_DADOS = "tarefas_dados"
+MAX_PROCESSOS = min(4, os.cpu_count() or 1)
+INTERVALO_VERIFICACAO = 0.5  # segundos
+# Sem batimento nesse intervalo, o worker é considerado parado
+BATIMENTO_EXPIRA = 15  # segundos
+# O worker encerra depois desse tempo sem tarefas
+OCIOSO_MAXIMO = 300  # segundos
+VALIDADE_PADRAO = 7 * 24 * 3600  # segundos
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+ERRO = "erro"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tarefas (
+    id TEXT PRIMARY KEY,
+    funcao TEXT NOT NULL,
+    parametros TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progresso REAL NOT NULL DEFAULT 0,
+    mensagem TEXT NOT NULL DEFAULT '',
+    resultado TEXT,
+    erro TEXT,
+    criado_em REAL NOT NULL,
+    iniciado_em REAL,
+    concluido_em REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tarefas_status ON tarefas (status, criado_em);
+CREATE TABLE IF NOT EXISTS worker (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    pid INTEGER NOT NULL,
+    batimento REAL NOT NULL
+);
+"""
+
+
+def id_tarefa(funcao, parametros):
+    """Id determinístico: mesma função e mesmos parâmetros, mesma tarefa."""
+    chave = json.dumps([funcao, parametros], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(chave.encode("utf-8")).hexdigest()[:32]
+
+
+@contextmanager
+def _conectar(caminho_db):
+    conn = sqlite3.connect(caminho_db, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+class ContextoTarefa:
+    """Passado à função da tarefa, no processo de trabalho, para informar o progresso."""
+
+    def __init__(self, caminho_db, id_tarefa, intervalo=INTERVALO_VERIFICACAO):
+        self.caminho_db = caminho_db
+        self.id = id_tarefa
+        self.intervalo = intervalo
+        self._ultima_gravacao = 0.0
+
+    def progresso(self, fracao, mensagem=""):
+        """Grava o progresso (0 a 1), no máximo uma vez por intervalo."""
+        agora = time.monotonic()
+        if fracao < 1 and agora - self._ultima_gravacao < self.intervalo:
+            return
+        self._ultima_gravacao = agora
+        with _conectar(self.caminho_db) as conn:
+            conn.execute(
+                "UPDATE tarefas SET progresso = ?, mensagem = ? WHERE id = ?",
+                (min(max(float(fracao), 0.0), 1.0), mensagem, self.id)
+            )
+
+
+def _executar(caminho_db, diretorio, id_tarefa, funcao, parametros):
+    # roda no processo do pool: importa a função, executa e grava o resultado
+    nome_modulo, nome_funcao = funcao.split(":")
+    alvo = getattr(importlib.import_module(nome_modulo), nome_funcao)
+    resultado = alvo(ContextoTarefa(caminho_db, id_tarefa), **parametros)
+    caminho = os.path.join(diretorio, "resultados", f"{id_tarefa}.pkl")
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as f:
+        pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+class FilaTarefas:
+    """
+    Tabela de tarefas (SQLite) e pasta de dados (entradas e resultados).
+
+    Nos apps: submeter() -> id, status(id) para acompanhar e resultado(id)
+    quando a tarefa estiver concluída.
+    """
+
+    def __init__(self, caminho_db=CAMINHO_DB, diretorio=DIRETORIO_DADOS):
+        self.caminho_db = os.path.abspath(caminho_db)
+        self.diretorio = os.path.abspath(diretorio)
+        os.makedirs(os.path.join(self.diretorio, "entradas"), exist_ok=True)
+        os.makedirs(os.path.join(self.diretorio, "resultados"), exist_ok=True)
+        with _conectar(self.caminho_db) as conn:
+            conn.executescript(SCHEMA)
+
+    # ---- uso pelos apps ----
+    def salvar_entrada(self, conteudo, sufixo=".pdf"):
+        """Grava o arquivo enviado (nome = hash do conteúdo) e devolve o caminho."""
+        caminho = os.path.join(self.diretorio, "entradas", hashlib.sha256(conteudo).hexdigest() + sufixo)
+        if not os.path.exists(caminho):
+            temporario = caminho + f".{os.getpid()}.tmp"
+            with open(temporario, "wb") as f:
+                f.write(conteudo)
+            os.replace(temporario, caminho)
+        return caminho
+
+    def submeter(self, funcao, refazer=False, **parametros):
+        """
+        Registra a tarefa e garante um worker ativo. Se a mesma tarefa já
+        existir, reaproveita-a (resultado em cache); com `refazer`, uma tarefa
+        concluída ou com erro volta para a fila. Tarefas com erro sempre voltam.
+        """
+        id_ = id_tarefa(funcao, parametros)
+        finais = (CONCLUIDA, ERRO) if refazer else (ERRO,)
+        with _conectar(self.caminho_db) as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO tarefas (id, funcao, parametros, status, criado_em) VALUES (?, ?, ?, ?, ?)",
+                (id_, funcao, json.dumps(parametros, ensure_ascii=False), PENDENTE, time.time())
+            )
+            conn.execute(
+                f"UPDATE tarefas SET status = ?, progresso = 0, mensagem = '', erro = NULL, criado_em = ? "
+                f"WHERE id = ? AND status IN ({', '.join('?' * len(finais))})",
+                (PENDENTE, time.time(), id_, *finais)
+            )
+        self.garantir_worker()
+        return id_
+
+    def status(self, id_):
+        """
+        Dicionário com status, progresso, mensagem e erro da tarefa (None se não
+        existir). Enquanto a tarefa não termina, garante um worker ativo: se o
+        anterior parou, o novo devolve as tarefas em execução para a fila.
+        """
+        with _conectar(self.caminho_db) as conn:
+            linha = conn.execute(
+                "SELECT id, funcao, status, progresso, mensagem, erro, criado_em, iniciado_em, concluido_em "
+                "FROM tarefas WHERE id = ?", (id_,)
+            ).fetchone()
+        if linha and linha["status"] in (PENDENTE, EXECUTANDO):
+            self.garantir_worker()
+        return dict(linha) if linha else None
+
+    def resultado(self, id_):
+        """Resultado de uma tarefa concluída."""
+        with _conectar(self.caminho_db) as conn:
+            linha = conn.execute("SELECT status, resultado FROM tarefas WHERE id = ?", (id_,)).fetchone()
+        if linha is None or linha["status"] != CONCLUIDA:
+            raise ValueError(f"Tarefa {id_} não concluída")
+        with open(linha["resultado"], "rb") as f:
+            return pickle.load(f)
+
+    def limpar_antigas(self, validade=VALIDADE_PADRAO):
+        """Remove tarefas finalizadas (e seus resultados) mais antigas que a validade."""
+        limite = time.time() - validade
+        with _conectar(self.caminho_db) as conn:
+            antigas = conn.execute(
+                "SELECT id, resultado FROM tarefas WHERE status IN (?, ?) AND concluido_em < ?",
+                (CONCLUIDA, ERRO, limite)
+            ).fetchall()
+            conn.executemany("DELETE FROM tarefas WHERE id = ?", [(t["id"],) for t in antigas])
+        for tarefa in antigas:
+            if tarefa["resultado"] and os.path.exists(tarefa["resultado"]):
+                os.remove(tarefa["resultado"])
+        return len(antigas)
+
+    # ---- worker ----
+    def worker_ativo(self):
+        with _conectar(self.caminho_db) as conn:
+            linha = conn.execute("SELECT batimento FROM worker WHERE id = 1").fetchone()
+        return bool(linha) and time.time() - linha["batimento"] < BATIMENTO_EXPIRA
+
+    def garantir_worker(self):
+        """Inicia o processo worker em segundo plano, se nenhum estiver ativo."""
+        if self.worker_ativo():
+            return
+        log = open(os.path.join(self.diretorio, "worker.log"), "ab")
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "worker", "--db", self.caminho_db, "--dados", self.diretorio],
+            stdout=log, stderr=log, stdin=subprocess.DEVNULL, start_new_session=True
+        )
+        log.close()
+
+    def _assumir_worker(self, pid):
+        # só um worker por banco: assume o posto se o batimento anterior expirou
+        agora = time.time()
+        with _conectar(self.caminho_db) as conn:
+            conn.execute("INSERT OR IGNORE INTO worker (id, pid, batimento) VALUES (1, 0, 0)")
+            cur = conn.execute(
+                "UPDATE worker SET pid = ?, batimento = ? WHERE id = 1 AND (pid = ? OR batimento < ?)",
+                (pid, agora, pid, agora - BATIMENTO_EXPIRA)
+            )
+            if cur.rowcount == 1:
+                # tarefas que estavam em execução num worker anterior voltam para a fila
+                conn.execute("UPDATE tarefas SET status = ? WHERE status = ?", (PENDENTE, EXECUTANDO))
+        return cur.rowcount == 1
+
+    def _batimento(self, pid):
+        with _conectar(self.caminho_db) as conn:
+            conn.execute("UPDATE worker SET batimento = ? WHERE id = 1 AND pid = ?", (time.time(), pid))
+
+    def _liberar_worker(self, pid):
+        with _conectar(self.caminho_db) as conn:
+            conn.execute("UPDATE worker SET batimento = 0 WHERE id = 1 AND pid = ?", (pid,))
+
+    def _reservar(self, quantidade):
+        if quantidade <= 0:
+            return []
+        with _conectar(self.caminho_db) as conn:
+            tarefas = conn.execute(
+                "SELECT id, funcao, parametros FROM tarefas WHERE status = ? ORDER BY criado_em LIMIT ?",
+                (PENDENTE, quantidade)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tarefas SET status = ?, progresso = 0, iniciado_em = ? WHERE id = ?",
+                [(EXECUTANDO, time.time(), t["id"]) for t in tarefas]
+            )
+        return [(t["id"], t["funcao"], json.loads(t["parametros"])) for t in tarefas]
+
+    def _finalizar(self, id_, resultado=None, erro=None):
+        with _conectar(self.caminho_db) as conn:
+            conn.execute(
+                "UPDATE tarefas SET status = ?, progresso = ?, resultado = ?, erro = ?, concluido_em = ? WHERE id = ?",
+                (ERRO if erro else CONCLUIDA, 0 if erro else 1, resultado, erro, time.time(), id_)
+            )
+
+
+def executar_worker(caminho_db=CAMINHO_DB, diretorio=DIRETORIO_DADOS, max_processos=MAX_PROCESSOS,
+                    ocioso_maximo=OCIOSO_MAXIMO):
+    """Laço do worker: reserva tarefas pendentes e as executa no pool de processos."""
+    fila = FilaTarefas(caminho_db, diretorio)
+    pid = os.getpid()
+    if not fila._assumir_worker(pid):
+        return
+    try:
+        ocioso_desde = time.monotonic()
+        while time.monotonic() - ocioso_desde < ocioso_maximo:
+            with ProcessPoolExecutor(max_workers=max_processos) as pool:
+                em_execucao = {}
+                while True:
+                    fila._batimento(pid)
+                    for id_, funcao, parametros in fila._reservar(max_processos - len(em_execucao)):
+                        futuro = pool.submit(_executar, fila.caminho_db, fila.diretorio, id_, funcao, parametros)
+                        em_execucao[futuro] = id_
+                    if not em_execucao:
+                        if time.monotonic() - ocioso_desde >= ocioso_maximo:
+                            break
+                        time.sleep(INTERVALO_VERIFICACAO)
+                        continue
+                    ocioso_desde = time.monotonic()
+                    prontos, _ = wait(em_execucao, timeout=INTERVALO_VERIFICACAO, return_when=FIRST_COMPLETED)
+                    quebrado = False
+                    for futuro in prontos:
+                        id_ = em_execucao.pop(futuro)
+                        try:
+                            fila._finalizar(id_, resultado=futuro.result())
+                        except BrokenProcessPool as e:
+                            fila._finalizar(id_, erro=f"Processo de trabalho encerrado: {e}")
+                            quebrado = True
+                        except Exception as e:
+                            fila._finalizar(id_, erro=f"{type(e).__name__}: {e}")
+                    if quebrado:
+                        # um processo morreu (falta de memória, por exemplo): recria o pool
+                        for id_ in em_execucao.values():
+                            fila._finalizar(id_, erro="Processo de trabalho encerrado")
+                        break
+    finally:
+        fila._liberar_worker(pid)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tarefas longas dos apps (extrações de PDF)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_worker = sub.add_parser("worker", help="Executa as tarefas pendentes (iniciado pelos apps)")
+    p_worker.add_argument("--db", default=CAMINHO_DB)
+    p_worker.add_argument("--dados", default=DIRETORIO_DADOS)
+    p_worker.add_argument("--processos", type=int, default=MAX_PROCESSOS)
+    p_limpar = sub.add_parser("limpar", help="Remove tarefas finalizadas antigas")
+    p_limpar.add_argument("--db", default=CAMINHO_DB)
+    p_limpar.add_argument("--dados", default=DIRETORIO_DADOS)
+    args = parser.parse_args()
+
+    if args.comando == "worker":
+        executar_worker(args.db, args.dados, args.processos)
+    else:
+        print(FilaTarefas(args.db, args.dados).limpar_antigas())
@@ -0,0 +1,35 @@
+"""
+Funções de tarefa (ver tarefas.py) das extrações de PDF dos apps.
+
+Executadas nos processos do worker: recebem o contexto da tarefa (progresso)
+e o caminho do PDF gravado por FilaTarefas.salvar_entrada. O retorno é
+gravado como resultado da tarefa.
+"""
+
+from medalhistas import extract_pdf_rows
+from tabelas_pdf import extract_tables_from_pdf
+
+
+def extrair_tabelas_pdf(contexto, caminho, deduplicate=True):
+    """Tabelas do PDF (tabelas_pdf.py). Retorna (lista de TableRecord, mensagens de erro)."""
+    erros = []
+    tabelas = extract_tables_from_pdf(
+        caminho,
+        deduplicate=deduplicate,
+        on_progress=lambda lidas, total: contexto.progresso(lidas / total, f"Página {lidas}/{total}"),
+        on_error=erros.append,
+    )
+    return tabelas, erros
+
+
+def extrair_medalhistas(contexto, caminho, modo, checkpoint_db):
+    """
+    Lista de medalhistas (medalhistas.py) gravada no checkpoint, que guarda
+    as linhas; retorna só os erros [(página, mensagem)].
+    """
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    return extract_pdf_rows(
+        conteudo, modo, checkpoint_db,
+        on_progress=lambda lidas, total: contexto.progresso(lidas / total, f"Página {lidas}/{total}"),
+    )
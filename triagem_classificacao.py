@@ -0,0 +1,160 @@
+"""
+Classificação das demandas da triagem a partir de uma tabela de regras.
+
+Cada regra associa uma categoria a palavras-chave e/ou expressões regulares.
+As regras são compiladas uma única vez: uma regex combinada classifica um
+texto numa só chamada, e uma regex por categoria reclassifica colunas
+inteiras de forma vetorizada (pandas). Na combinada, cada categoria fica num
+lookahead opcional com grupo nomeado, testado a partir do início do texto;
+assim um casamento de maior prioridade que se sobrepõe a outro não se perde.
+A comparação ignora acentos e maiúsculas. A ordem da tabela define a
+prioridade quando mais de uma categoria casa.
+
+O pandas e o numpy só são importados nas funções de colunas inteiras: o
+formulário, que classifica um texto por vez, inicia sem eles.
+"""
+
+import json
+import re
+import unicodedata
+
+from triagem_sheets import COLUNAS_PLANILHA
+
+CATEGORIA_PADRAO = "Outros"
+
+# Tabela padrão (equivalente às regras originais do formulário)
+REGRAS_PADRAO = [
+    {"categoria": "Previdenciário", "palavras": ["aposentadoria", "benefício", "inss"]},
+    {"categoria": "Trabalhista", "palavras": ["rescisão", "trabalho", "fgts"]},
+]
+
+
+def remover_acentos(texto):
+    texto = unicodedata.normalize("NFKD", texto)
+    return "".join(ch for ch in texto if not unicodedata.combining(ch))
+
+
+def normalizar_texto(texto):
+    """Remove acentos e converte para minúsculas."""
+    if not isinstance(texto, str):
+        return ""
+    return remover_acentos(texto).lower()
+
+
+def normalizar_serie(serie):
+    """
+    normalizar_texto aplicado a uma Series do pandas, uma vez por valor
+    distinto (as colunas da planilha repetem poucos valores).
+    """
+    import pandas as pd
+
+    serie = serie.fillna("").astype(str)
+    unicos = pd.unique(serie)
+    return serie.map(dict(zip(unicos, map(normalizar_texto, unicos))))
+
+
+def _padrao_regra(regra):
+    partes = [re.escape(normalizar_texto(p)) for p in regra.get("palavras", [])]
+    # regex: só os acentos são removidos (\W, \S etc. não podem virar minúsculas)
+    partes += [remover_acentos(r) for r in regra.get("regex", [])]
+    if not partes:
+        raise ValueError(f"Regra sem palavras nem regex: {regra.get('categoria')}")
+    return "|".join(partes)
+
+
+def carregar_regras(caminho):
+    """Lê a tabela de regras de um arquivo JSON (lista de regras)."""
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Classificador:
+    """
+    Classificador compilado a partir de uma tabela de regras:
+
+        [{"categoria": "...", "palavras": [...], "regex": [...]}, ...]
+    """
+
+    def __init__(self, regras=REGRAS_PADRAO, padrao=CATEGORIA_PADRAO):
+        self.categorias = [r["categoria"] for r in regras]
+        self.padrao = padrao
+        padroes = [_padrao_regra(r) for r in regras]
+        self._por_categoria = [re.compile(p, re.IGNORECASE) for p in padroes]
+        # grupo c<i> preenchido se a categoria i casa em qualquer ponto do texto
+        self._combinada = re.compile(
+            "".join(f"(?:(?=[\\s\\S]*?(?P<c{i}>{p})))?" for i, p in enumerate(padroes)),
+            re.IGNORECASE
+        )
+
+    def _categoria_de(self, texto):
+        grupos = self._combinada.match(normalizar_texto(texto))
+        for i, categoria in enumerate(self.categorias):
+            if grupos.group(f"c{i}") is not None:
+                return categoria
+        return None
+
+    def classificar(self, tipo, urgencia=""):
+        """
+        Classifica pelo tipo de demanda; se nada casar, usa o texto livre da
+        urgência.
+        """
+        return self._categoria_de(tipo) or self._categoria_de(urgencia) or self.padrao
+
+    def classificar_serie(self, tipos, urgencias=None):
+        """Classifica colunas inteiras (Series) de uma vez."""
+        import numpy as np
+        import pandas as pd
+
+        tipos = normalizar_serie(pd.Series(tipos))
+        condicoes = [tipos.str.contains(p) for p in self._por_categoria]
+        if urgencias is not None:
+            urgencias = normalizar_serie(pd.Series(urgencias, index=tipos.index))
+            sem_tipo = ~np.logical_or.reduce(condicoes) if condicoes else True
+            condicoes += [sem_tipo & urgencias.str.contains(p) for p in self._por_categoria]
+            escolhas = self.categorias * 2
+        else:
+            escolhas = self.categorias
+        return pd.Series(np.select(condicoes, escolhas, default=self.padrao), index=tipos.index)
+
+
+CLASSIFICADOR_PADRAO = Classificador()
+
+
+def _letra_coluna(indice):
+    """Índice 0-based -> letra da coluna (0 -> A)."""
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def reclassificar_planilha(conexao, classificador=CLASSIFICADOR_PADRAO, cabecalho=True):
+    """
+    Reclassifica todas as linhas da planilha em uma passada vetorizada e grava
+    a coluna de classificação com uma única atualização em lote.
+    Retorna a quantidade de linhas cuja classificação mudou.
+    """
+    import pandas as pd
+
+    valores = conexao.executar(lambda aba: aba.get_all_values())
+    inicio = 1 if cabecalho else 0
+    linhas = valores[inicio:]
+    if not linhas:
+        return 0
+
+    largura = len(COLUNAS_PLANILHA)
+    df = pd.DataFrame([(l + [""] * largura)[:largura] for l in linhas], columns=COLUNAS_PLANILHA)
+    novas = classificador.classificar_serie(df["tipo_de_demanda"], df["urgencia"])
+    alteradas = int((novas != df["classificacao"]).sum())
+    if alteradas == 0:
+        return 0
+
+    coluna = _letra_coluna(COLUNAS_PLANILHA.index("classificacao"))
+    primeira = inicio + 1
+    intervalo = f"{coluna}{primeira}:{coluna}{primeira + len(df) - 1}"
+    conexao.executar(lambda aba: aba.batch_update(
+        [{"range": intervalo, "values": [[v] for v in novas.tolist()]}]
+    ))
+    return alteradas
@@ -0,0 +1,80 @@
+"""
+Detecção de envios duplicados da triagem (duplo clique, reenvio do formulário).
+
+Cada envio gera uma chave de idempotência: hash do nome, tipo de demanda e
+contato preferencial normalizados (sem acentos, minúsculas, espaços únicos).
+As chaves recentes ficam num índice SQLite local com validade (TTL); a
+consulta é por chave primária, sem varrer a planilha. Dentro da validade, o
+envio repetido recebe a mesma chave de envio do original, o que permite
+atualizar a linha ainda pendente na fila em vez de criar outra.
+"""
+
+import hashlib
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from triagem_classificacao import normalizar_texto
+
+TTL_PADRAO = 24 * 3600  # segundos
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS envios_recentes (
+    hash TEXT PRIMARY KEY,
+    chave_envio TEXT NOT NULL,
+    criado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_envios_criado_em ON envios_recentes (criado_em);
+"""
+
+
+def chave_idempotencia(nome, tipo_de_demanda, contato):
+    """Hash dos campos normalizados que identificam um envio."""
+    partes = [" ".join(normalizar_texto(v).split()) for v in (nome, tipo_de_demanda, contato)]
+    return hashlib.sha256("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+
+class IndiceEnvios:
+    """
+    Índice local dos envios recentes.
+
+    registrar(hash) -> (novo, chave_envio): `novo` é False quando o mesmo envio
+    já foi registrado dentro da validade; nesse caso `chave_envio` é a do original.
+    """
+
+    def __init__(self, caminho_db, ttl=TTL_PADRAO):
+        self.caminho_db = caminho_db
+        self.ttl = ttl
+        with self._conectar() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _conectar(self):
+        conn = sqlite3.connect(self.caminho_db, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def registrar(self, hash_envio):
+        agora = time.time()
+        chave_nova = f"{hash_envio[:32]}-{int(agora)}"
+        with self._conectar() as conn:
+            # remove expirados (índice em criado_em) antes de inserir
+            conn.execute("DELETE FROM envios_recentes WHERE criado_em < ?", (agora - self.ttl,))
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO envios_recentes (hash, chave_envio, criado_em) VALUES (?, ?, ?)",
+                (hash_envio, chave_nova, agora)
+            )
+            if cur.rowcount == 1:
+                return True, chave_nova
+            existente = conn.execute(
+                "SELECT chave_envio FROM envios_recentes WHERE hash = ?", (hash_envio,)
+            ).fetchone()
+        return False, existente[0]
+
+    def esquecer(self, hash_envio):
+        """Remove um envio do índice (por exemplo, se a gravação falhou)."""
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM envios_recentes WHERE hash = ?", (hash_envio,))
@@ -0,0 +1,224 @@
+"""
+Fila local (write-behind) para os envios da triagem.
+
+O formulário grava a linha numa fila SQLite e responde na hora; uma thread
+de fundo envia as linhas pendentes em lotes (append_rows), com espera
+exponencial quando a API do Google responde 429 (cota de escrita).
+
+A entrega é "pelo menos uma vez": a linha só é marcada como enviada depois
+que o lote foi aceito. O lote é reservado (enviando_em) na mesma transação
+que o seleciona; linhas reservadas não aceitam mais atualização, para que um
+reenvio durante o envio não seja dado como gravado e depois perdido.
+
+Cada linha tem uma chave única (dedupe): reenvios com a mesma chave são
+ignorados na fila e a chave vai na última coluna da planilha, para que
+eventuais repetições possam ser descartadas na leitura.
+
+Qualquer função que receba uma lista de linhas serve como destino, por
+exemplo o append_rows de uma aba falsa em memória.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fila (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chave TEXT NOT NULL UNIQUE,
+    dados TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    enviando_em REAL,
+    enviado_em REAL
+);
+CREATE INDEX IF NOT EXISTS idx_fila_pendentes ON fila (enviado_em, id);
+"""
+
+
+def erro_de_cota(erro):
+    """Indica se o erro é um 429 (limite de requisições da API)."""
+    codigo = getattr(erro, "code", None)
+    if codigo is None:
+        codigo = getattr(getattr(erro, "response", None), "status_code", None)
+    return codigo == 429
+
+
+def enviar_para_planilha(conexao):
+    """
+    Destino padrão: append_rows na aba de uma ConexaoPlanilha. Os valores vão
+    como texto (RAW): campos do formulário iniciados por "=" não viram fórmula.
+    """
+    def enviar(linhas):
+        conexao.executar(lambda aba: aba.append_rows(linhas, value_input_option="RAW"))
+    return enviar
+
+
+class FilaEnvio:
+    """
+    Fila persistente de linhas a enviar para a planilha.
+
+    - enfileirar(dados, chave): grava a linha (retorna False se a chave já existe)
+    - atualizar_pendente(chave, dados): substitui uma linha ainda não enviada
+    - processar_pendentes(): envia um lote de forma síncrona
+    - iniciar()/parar(): controla a thread de envio em segundo plano
+    """
+
+    def __init__(self, caminho_db, enviar_lote, tamanho_lote=50, intervalo=2.0,
+                 espera_inicial=1.0, espera_maxima=120.0, incluir_chave=True, reserva_expira=600.0):
+        self.caminho_db = caminho_db
+        self.enviar_lote = enviar_lote
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.incluir_chave = incluir_chave
+        # reserva de um envio interrompido (processo encerrado) expira depois disso
+        self.reserva_expira = reserva_expira
+        self._falhas_seguidas = 0
+        self._ultimo_erro = None
+        self._parar = threading.Event()
+        self._acordar = threading.Event()
+        self._thread = None
+        with self._conectar() as conn:
+            conn.executescript(SCHEMA)
+            colunas = [c[1] for c in conn.execute("PRAGMA table_info(fila)")]
+            if "enviando_em" not in colunas:
+                # filas criadas antes da reserva dos lotes
+                conn.execute("ALTER TABLE fila ADD COLUMN enviando_em REAL")
+
+    @contextmanager
+    def _conectar(self):
+        conn = sqlite3.connect(self.caminho_db, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def enfileirar(self, dados, chave=None):
+        """Grava a linha na fila. Retorna False se a chave já foi enfileirada."""
+        chave = chave or uuid.uuid4().hex
+        with self._conectar() as conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO fila (chave, dados, criado_em) VALUES (?, ?, ?)",
+                (chave, json.dumps(list(dados), ensure_ascii=False), time.time())
+            )
+        self._acordar.set()
+        return cur.rowcount == 1
+
+    def atualizar_pendente(self, chave, dados):
+        """
+        Substitui os dados de uma linha que ainda não foi enviada.
+        Retorna False se a chave não existe ou a linha já foi enviada ou está
+        sendo enviada (reservada num lote).
+        """
+        with self._conectar() as conn:
+            cur = conn.execute(
+                "UPDATE fila SET dados = ? WHERE chave = ? AND enviado_em IS NULL "
+                "AND (enviando_em IS NULL OR enviando_em < ?)",
+                (json.dumps(list(dados), ensure_ascii=False), chave, time.time() - self.reserva_expira)
+            )
+        return cur.rowcount == 1
+
+    def pendentes(self):
+        """Quantidade de linhas ainda não enviadas."""
+        with self._conectar() as conn:
+            return conn.execute("SELECT COUNT(*) FROM fila WHERE enviado_em IS NULL").fetchone()[0]
+
+    def processar_pendentes(self):
+        """
+        Envia um lote de linhas pendentes. Retorna quantas foram enviadas.
+        Exceções do destino são propagadas e as linhas continuam pendentes.
+        """
+        agora = time.time()
+        with self._conectar() as conn:
+            # seleção e reserva na mesma transação (atualizar_pendente espera por ela)
+            conn.execute("BEGIN IMMEDIATE")
+            registros = conn.execute(
+                "SELECT id, chave, dados FROM fila WHERE enviado_em IS NULL "
+                "AND (enviando_em IS NULL OR enviando_em < ?) ORDER BY id LIMIT ?",
+                (agora - self.reserva_expira, self.tamanho_lote)
+            ).fetchall()
+            conn.executemany("UPDATE fila SET enviando_em = ? WHERE id = ?", [(agora, r[0]) for r in registros])
+        if not registros:
+            return 0
+
+        linhas = []
+        for _, chave, dados in registros:
+            linha = json.loads(dados)
+            if self.incluir_chave:
+                linha.append(chave)
+            linhas.append(linha)
+
+        ids = [(r[0],) for r in registros]
+        try:
+            self.enviar_lote(linhas)
+        except Exception:
+            with self._conectar() as conn:
+                conn.executemany(
+                    "UPDATE fila SET tentativas = tentativas + 1, enviando_em = NULL WHERE id = ?", ids
+                )
+            raise
+
+        agora = time.time()
+        with self._conectar() as conn:
+            conn.executemany("UPDATE fila SET enviado_em = ? WHERE id = ?", [(agora, i) for (i,) in ids])
+        return len(registros)
+
+    def limpar_enviados(self, dias=7):
+        """Remove da fila as linhas enviadas há mais de `dias` dias."""
+        limite = time.time() - dias * 86400
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM fila WHERE enviado_em IS NOT NULL AND enviado_em < ?", (limite,))
+
+    def _espera_apos_falha(self):
+        # backoff exponencial com jitter; 429 começa com espera maior
+        base = self.espera_inicial * (4 if erro_de_cota(self._ultimo_erro) else 1)
+        espera = min(self.espera_maxima, base * 2 ** (self._falhas_seguidas - 1))
+        return espera * random.uniform(0.5, 1.0)
+
+    def _loop(self):
+        while not self._parar.is_set():
+            try:
+                enviados = self.processar_pendentes()
+                self._falhas_seguidas = 0
+                self._ultimo_erro = None
+                if enviados == self.tamanho_lote:
+                    continue  # ainda pode haver mais linhas: envia o próximo lote já
+                # novos envios acordam a thread antes do intervalo
+                self._acordar.wait(self.intervalo)
+                self._acordar.clear()
+            except Exception as e:
+                self._falhas_seguidas += 1
+                self._ultimo_erro = e
+                # durante o backoff novos envios não encurtam a espera
+                self._parar.wait(self._espera_apos_falha())
+
+    def iniciar(self):
+        """Inicia a thread de envio (idempotente)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._loop, name="triagem-fila", daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self, timeout=None):
+        """Sinaliza a thread para encerrar e aguarda."""
+        self._parar.set()
+        self._acordar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self):
+        """Resumo para diagnóstico: pendentes, falhas seguidas e último erro."""
+        return {
+            "pendentes": self.pendentes(),
+            "falhas_seguidas": self._falhas_seguidas,
+            "ultimo_erro": repr(self._ultimo_erro) if self._ultimo_erro else None,
+        }
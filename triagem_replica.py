@@ -0,0 +1,142 @@
+"""
+Réplica local (SQLite) da planilha "Triagem_Clientes".
+
+A sincronização é incremental: a réplica guarda a última linha da planilha
+já copiada e busca apenas as linhas seguintes (get_values por intervalo, em
+blocos). As consultas do painel são feitas na réplica, sem chamar a API do
+Google. Linhas repetidas pela fila de envio (mesma chave_envio) são
+descartadas na cópia.
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from triagem_sheets import COLUNAS_PLANILHA
+
+TAMANHO_BLOCO = 1000
+ULTIMA_COLUNA = chr(64 + len(COLUNAS_PLANILHA))  # COLUNAS_PLANILHA tem menos de 27 colunas
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS triagem (
+    linha INTEGER PRIMARY KEY,
+    {", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in COLUNAS_PLANILHA)}
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_triagem_chave
+    ON triagem (chave_envio) WHERE chave_envio != '';
+CREATE INDEX IF NOT EXISTS idx_triagem_classificacao ON triagem (classificacao);
+CREATE TABLE IF NOT EXISTS sincronizacao (
+    chave TEXT PRIMARY KEY,
+    valor REAL NOT NULL
+);
+"""
+
+# Agrupamentos disponíveis no painel (coluna ou expressão SQL)
+AGRUPAMENTOS = {
+    "classificacao": "classificacao",
+    "contato_preferencial": "contato_preferencial",
+    "urgencia": "CASE WHEN TRIM(urgencia) = '' THEN 'Não informada' ELSE 'Informada' END",
+}
+
+
+class ReplicaTriagem:
+    """Cópia local da planilha, sincronizada de forma incremental."""
+
+    def __init__(self, caminho_db, cabecalho=True):
+        self.caminho_db = caminho_db
+        # com cabeçalho, os dados começam na linha 2 da planilha
+        self.primeira_linha = 2 if cabecalho else 1
+        with self._conectar() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _conectar(self):
+        conn = sqlite3.connect(self.caminho_db, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _meta(self, conn, chave, padrao=0):
+        linha = conn.execute("SELECT valor FROM sincronizacao WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha else padrao
+
+    def _gravar_meta(self, conn, chave, valor):
+        conn.execute("INSERT OR REPLACE INTO sincronizacao (chave, valor) VALUES (?, ?)", (chave, valor))
+
+    def ultima_linha(self):
+        """Última linha da planilha já copiada (0 se nenhuma)."""
+        with self._conectar() as conn:
+            return int(self._meta(conn, "ultima_linha"))
+
+    def ultima_sincronizacao(self):
+        """Momento (epoch) da última sincronização, ou None."""
+        with self._conectar() as conn:
+            return self._meta(conn, "sincronizado_em", None)
+
+    def sincronizar(self, conexao, intervalo_minimo=0):
+        """
+        Copia as linhas novas da planilha. Se a última sincronização ocorreu
+        há menos de `intervalo_minimo` segundos, não faz nada.
+        Retorna a quantidade de linhas novas gravadas.
+        """
+        ultima = self.ultima_sincronizacao()
+        if ultima is not None and time.time() - ultima < intervalo_minimo:
+            return 0
+
+        inicio = max(self.ultima_linha() + 1, self.primeira_linha)
+        largura = len(COLUNAS_PLANILHA)
+        novas = 0
+        while True:
+            fim = inicio + TAMANHO_BLOCO - 1
+            intervalo = f"A{inicio}:{ULTIMA_COLUNA}{fim}"
+            valores = conexao.executar(lambda aba: aba.get_values(intervalo))
+            registros = [
+                (inicio + i, *(l + [""] * largura)[:largura])
+                for i, l in enumerate(valores)
+            ]
+            with self._conectar() as conn:
+                if registros:
+                    cur = conn.executemany(
+                        f"INSERT OR IGNORE INTO triagem (linha, {', '.join(COLUNAS_PLANILHA)}) "
+                        f"VALUES ({', '.join('?' * (largura + 1))})",
+                        registros
+                    )
+                    novas += cur.rowcount
+                    self._gravar_meta(conn, "ultima_linha", inicio + len(valores) - 1)
+                self._gravar_meta(conn, "sincronizado_em", time.time())
+            if len(valores) < TAMANHO_BLOCO:
+                return novas
+            inicio = fim + 1
+
+    def ressincronizar(self, conexao):
+        """Apaga a réplica e copia a planilha inteira (após reclassificações, por ex.)."""
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM triagem")
+            conn.execute("DELETE FROM sincronizacao")
+        return self.sincronizar(conexao)
+
+    def total(self):
+        with self._conectar() as conn:
+            return conn.execute("SELECT COUNT(*) FROM triagem").fetchone()[0]
+
+    def contagem_por(self, agrupamento):
+        """Contagem de registros por classificacao, urgencia ou contato_preferencial."""
+        expressao = AGRUPAMENTOS[agrupamento]
+        with self._conectar() as conn:
+            return pd.read_sql_query(
+                f"SELECT {expressao} AS {agrupamento}, COUNT(*) AS quantidade "
+                f"FROM triagem GROUP BY 1 ORDER BY quantidade DESC",
+                conn
+            )
+
+    def ultimos(self, limite=50):
+        """Registros mais recentes (maiores números de linha primeiro)."""
+        with self._conectar() as conn:
+            return pd.read_sql_query(
+                f"SELECT linha, {', '.join(COLUNAS_PLANILHA)} FROM triagem ORDER BY linha DESC LIMIT ?",
+                conn, params=(limite,)
+            )
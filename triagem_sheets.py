@@ -0,0 +1,158 @@
+"""
+Conexão compartilhada com a planilha "Triagem_Clientes" (Google Sheets).
+
+O cliente gspread é criado uma única vez por processo, de forma preguiçosa
+(só na primeira operação), e reaproveitado por todas as sessões do Streamlit.
+gspread e as bibliotecas do Google também só são importados nesse momento:
+quem usa apenas COLUNAS_PLANILHA (classificação, réplica) não paga o import.
+A planilha é aberta pela chave (sem busca no Drive) quando ela é informada.
+Em erros de autenticação ou HTTP transitórios o cliente é recriado e a
+operação é repetida.
+
+Uso no Streamlit:
+
+    @st.cache_resource
+    def obter_conexao():
+        return conexao_de_secrets(st.secrets)
+"""
+
+import threading
+import time
+
+SCOPES = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive"
+]
+NOME_PLANILHA = "Triagem_Clientes"
+
+# Ordem das colunas gravadas pelo formulário (a última é a chave de envio da fila)
+COLUNAS_PLANILHA = [
+    "nome",
+    "tipo_de_demanda",
+    "classificacao",
+    "processo_em_andamento",
+    "urgencia",
+    "documentos_disponiveis",
+    "contato_preferencial",
+    "chave_envio",
+]
+
+# Códigos HTTP que justificam recriar o cliente e tentar de novo
+STATUS_RECONEXAO = {401, 403, 500, 502, 503, 504}
+
+
+def erro_de_conexao(erro):
+    """Indica se o erro é de autenticação/transporte (vale reconectar)."""
+    import gspread
+    from google.auth.exceptions import RefreshError, TransportError
+
+    if isinstance(erro, (RefreshError, TransportError, ConnectionError)):
+        return True
+    if isinstance(erro, gspread.exceptions.APIError):
+        return getattr(erro, "code", None) in STATUS_RECONEXAO
+    return False
+
+
+class ConexaoPlanilha:
+    """
+    Cliente gspread + aba da planilha, compartilhados pelo processo.
+
+    - worksheet(): devolve a aba (conecta na primeira chamada)
+    - executar(operacao): chama operacao(aba), reconectando uma vez em caso de
+      erro de autenticação/HTTP
+    - metricas(): tempos de conexão e contadores
+    """
+
+    def __init__(self, info_credenciais, chave_planilha=None, nome_planilha=NOME_PLANILHA,
+                 indice_aba=0, tentativas=2):
+        self.info_credenciais = info_credenciais
+        self.chave_planilha = chave_planilha
+        self.nome_planilha = nome_planilha
+        self.indice_aba = indice_aba
+        self.tentativas = tentativas
+        self._lock = threading.Lock()
+        self._creds = None
+        self._client = None
+        self._aba = None
+        self._metricas = {
+            "conexoes": 0,
+            "reconexoes": 0,
+            "operacoes": 0,
+            "erros": 0,
+            "ultima_conexao_ms": None,
+            "tempo_total_conexao_ms": 0.0,
+            "ultima_operacao_ms": None,
+        }
+
+    def _conectar(self):
+        import gspread
+        from google.oauth2.service_account import Credentials
+
+        inicio = time.perf_counter()
+        self._creds = Credentials.from_service_account_info(self.info_credenciais, scopes=SCOPES)
+        self._client = gspread.authorize(self._creds)
+        if self.chave_planilha:
+            planilha = self._client.open_by_key(self.chave_planilha)
+        else:
+            # sem chave configurada: abre pelo nome (exige busca no Drive)
+            planilha = self._client.open(self.nome_planilha)
+        self._aba = planilha.get_worksheet(self.indice_aba)
+        duracao = (time.perf_counter() - inicio) * 1000
+        self._metricas["conexoes"] += 1
+        self._metricas["ultima_conexao_ms"] = round(duracao, 1)
+        self._metricas["tempo_total_conexao_ms"] += duracao
+
+    def _renovar_token(self):
+        # o AuthorizedSession do gspread também renova sob demanda; aqui a
+        # renovação é antecipada para não pagar o 401 na primeira chamada
+        if self._creds is not None and not self._creds.valid:
+            from google.auth.transport.requests import Request
+            self._creds.refresh(Request())
+
+    def worksheet(self):
+        """Devolve a aba da planilha, conectando na primeira chamada."""
+        with self._lock:
+            if self._aba is None:
+                self._conectar()
+            else:
+                self._renovar_token()
+            return self._aba
+
+    def descartar(self):
+        """Descarta o cliente atual; a próxima operação conecta novamente."""
+        with self._lock:
+            self._aba = None
+            self._client = None
+            self._metricas["reconexoes"] += 1
+
+    def executar(self, operacao):
+        """Executa operacao(aba), reconectando e repetindo em erros de conexão."""
+        for tentativa in range(self.tentativas):
+            try:
+                aba = self.worksheet()
+                inicio = time.perf_counter()
+                resultado = operacao(aba)
+                self._metricas["ultima_operacao_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+                self._metricas["operacoes"] += 1
+                return resultado
+            except Exception as e:
+                self._metricas["erros"] += 1
+                if not erro_de_conexao(e) or tentativa == self.tentativas - 1:
+                    raise
+                self.descartar()
+
+    def metricas(self):
+        """Cópia das métricas de conexão (tempos em milissegundos)."""
+        return dict(self._metricas)
+
+
+def conexao_de_secrets(secrets):
+    """
+    Cria a conexão a partir dos secrets do Streamlit: credenciais em
+    [gcp_service_account] e, opcionalmente, a chave da planilha em
+    planilha_triagem_key (trecho da URL entre /d/ e /edit).
+    """
+    return ConexaoPlanilha(
+        dict(secrets["gcp_service_account"]),
+        chave_planilha=secrets.get("planilha_triagem_key")
+    )
@@ -0,0 +1,135 @@
+"""
+Verificação de status (health check) dos aplicativos e sistemas do catálogo.
+
+Todas as URLs são consultadas ao mesmo tempo (asyncio), com um pool de
+conexões urllib3 compartilhado, limite de requisições simultâneas e tempo
+limite por host (os *.streamlit.app demoram mais quando estão "acordando").
+Os resultados ficam num cache em memória com validade (TTL), de modo que
+recarregar a página não dispara novas consultas a cada interação.
+
+Os apps do Streamlit Community Cloud que estão dormindo respondem com uma
+página de aviso; eles são marcados como `dormindo`, e aquecer() envia
+requisições ao endpoint de saúde para adiantar o cold start.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import urllib3
+
+TTL_PADRAO = 300  # segundos
+TIMEOUT_PADRAO = 5.0
+# Tempo limite por sufixo de host
+TIMEOUT_POR_HOST = {
+    ".streamlit.app": 15.0,
+}
+MAX_SIMULTANEAS = 10
+BYTES_LIDOS = 65536
+MARCAS_DORMINDO = (b"gone to sleep", b"get this app back up")
+HEADERS = {"User-Agent": "repositorio-status/1.0"}
+
+_pool = urllib3.PoolManager(num_pools=50, maxsize=2, retries=False, headers=HEADERS)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Status:
+    url: str
+    ok: bool
+    codigo: int = None
+    latencia_ms: float = None
+    dormindo: bool = False
+    erro: str = None
+    verificado_em: float = 0.0
+
+
+def timeout_para(url):
+    host = urlsplit(url).hostname or ""
+    for sufixo, timeout in TIMEOUT_POR_HOST.items():
+        if host.endswith(sufixo):
+            return timeout
+    return TIMEOUT_PADRAO
+
+
+def _consultar(url, pool):
+    inicio = time.perf_counter()
+    try:
+        resposta = pool.request(
+            "GET", url, timeout=urllib3.Timeout(total=timeout_para(url)),
+            preload_content=False, redirect=True
+        )
+        try:
+            corpo = resposta.read(BYTES_LIDOS)
+        finally:
+            resposta.release_conn()
+        latencia = (time.perf_counter() - inicio) * 1000
+        dormindo = any(m in corpo.lower() for m in MARCAS_DORMINDO)
+        return Status(
+            url=url,
+            ok=resposta.status < 400 and not dormindo,
+            codigo=resposta.status,
+            latencia_ms=round(latencia, 1),
+            dormindo=dormindo,
+            verificado_em=time.time(),
+        )
+    except Exception as e:
+        return Status(url=url, ok=False, erro=type(e).__name__, verificado_em=time.time())
+
+
+async def _consultar_todas(urls, pool, max_simultaneas):
+    semaforo = asyncio.Semaphore(max_simultaneas)
+
+    async def uma(url):
+        async with semaforo:
+            return await asyncio.to_thread(_consultar, url, pool)
+
+    return await asyncio.gather(*(uma(u) for u in urls))
+
+
+def verificar(urls, ttl=TTL_PADRAO, pool=None, max_simultaneas=MAX_SIMULTANEAS):
+    """
+    Status de todas as URLs ({url: Status}). Resultados com menos de `ttl`
+    segundos vêm do cache; as demais URLs são consultadas em paralelo.
+    """
+    pool = pool or _pool
+    agora = time.time()
+    with _cache_lock:
+        resultado = {u: _cache[u] for u in urls if u in _cache and agora - _cache[u].verificado_em < ttl}
+    pendentes = [u for u in dict.fromkeys(urls) if u not in resultado]
+    if pendentes:
+        novos = asyncio.run(_consultar_todas(pendentes, pool, max_simultaneas))
+        with _cache_lock:
+            for status in novos:
+                _cache[status.url] = status
+                resultado[status.url] = status
+    return resultado
+
+
+def url_saude(url):
+    """Endpoint de saúde dos apps Streamlit."""
+    return url.rstrip("/") + "/_stcore/health"
+
+
+def aquecer(urls, pool=None):
+    """
+    Envia requisições de aquecimento (sem esperar) aos apps marcados como
+    dormindo, para adiantar o cold start. Retorna a thread disparada.
+    """
+    pool = pool or _pool
+    alvos = [url_saude(u) for u in urls]
+
+    def disparar():
+        asyncio.run(_consultar_todas(alvos, pool, MAX_SIMULTANEAS))
+
+    thread = threading.Thread(target=disparar, name="aquecer-apps", daemon=True)
+    thread.start()
+    return thread
+
+
+def limpar_cache():
+    with _cache_lock:
+        _cache.clear()